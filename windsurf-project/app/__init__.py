@@ -69,4 +69,36 @@ def create_app(config_class=Config):
     with app.app_context():
         from . import models  # Import models
 
+    # Long-lived matching index and maintenance commands
+    from .services.job_index import job_index
+    from .services.profile_vectors import profile_vectors
+    from .services.sharded_scoring import sharded_scorer
+    from .services.ranking import hybrid_ranker
+    from .services.matching import job_matching_service
+    from .services.search_cache import search_cache
+    from .services.typeahead import typeahead
+    from .services.geocoding import geocoding_service
+    from .services.gazetteer import gazetteer
+    from .services.address_resolver import address_resolver
+    from .services.job_density import job_density
+    from .services.translation_cache import translation_cache
+    from .services.translation_batcher import translation_batcher
+    from .services.model_registry import model_registry
+    from .cli import register_cli
+    job_index.init_app(app)
+    profile_vectors.init_app(app)
+    sharded_scorer.init_app(app)
+    hybrid_ranker.init_app(app)
+    job_matching_service.init_app(app)
+    search_cache.init_app(app)
+    typeahead.init_app(app)
+    geocoding_service.init_app(app)
+    gazetteer.init_app(app)
+    address_resolver.init_app(app)
+    job_density.init_app(app)
+    translation_cache.init_app(app)
+    translation_batcher.init_app(app)
+    model_registry.init_app(app)
+    register_cli(app)
+
     return app
@@ -0,0 +1,128 @@
+import click
+from flask.cli import AppGroup, with_appcontext
+
+matching_cli = AppGroup('matching', help='Job matching maintenance commands.')
+search_cli = AppGroup('search', help='Full-text job search index.')
+density_cli = AppGroup('density', help='Per-cell job density counters for map views.')
+translation_cli = AppGroup('translation', help='Machine translation cache.')
+recommendations_cli = AppGroup('recommendations', help='Offline job recommendation batches.')
+
+
+@matching_cli.command('refit-index')
+def refit_index():
+    """Refit the job index engine and rebuild all rows."""
+    from app.services.job_index import job_index
+
+    job_index.refit()
+    click.echo(
+        f"Job index rebuilt: engine={job_index.engine.name} features={job_index.vocabulary_size} "
+        f"version={job_index.version}"
+    )
+
+
+@matching_cli.command('refresh-idf')
+@click.option('--chunk-size', type=int, default=2000, help='Jobs hashed per chunk.')
+def refresh_idf(chunk_size):
+    """Recompute the hashing engine's IDF vector from open jobs."""
+    from app.models import Job
+    from app.services.job_index import job_index, job_text
+
+    engine = job_index.engine
+    if not hasattr(engine, 'refresh_idf'):
+        raise click.ClickException("MATCHING_VECTORIZER is not 'hashing'; nothing to refresh.")
+
+    def chunks():
+        last_id = 0
+        while True:
+            jobs = Job.query.filter(Job.status == 'open', Job.id > last_id).order_by(Job.id).limit(chunk_size).all()
+            if not jobs:
+                return
+            yield [job_text(job) for job in jobs]
+            last_id = jobs[-1].id
+
+    n_docs = engine.refresh_idf(chunks())
+    job_index.refit()
+    click.echo(f"IDF refreshed from {n_docs} open jobs -> {engine.idf_path}")
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """Create the full-text job index if missing and backfill every job."""
+    from app.services.search_index import search_index
+
+    count = search_index.rebuild()
+    click.echo(f"Search index rebuilt ({search_index.dialect}): {count} jobs")
+
+
+@density_cli.command('rebuild')
+def rebuild_density():
+    """Recount job density cells from every job's geohash."""
+    from app.services.job_density import job_density
+
+    count = job_density.rebuild()
+    click.echo(f"Job density rebuilt: {count} cells up to precision {job_density.max_precision}")
+
+
+@recommendations_cli.command('build')
+@click.option('--full', is_flag=True, help='Rescore every worker, not only changed profiles.')
+@click.option('--top-n', type=int, default=None, help='Recommendations stored per worker.')
+@click.option('--chunk-size', type=int, default=None, help='Workers scored per matrix multiplication.')
+@click.option('--workers', type=int, default=None, help='Scoring processes (defaults to all cores).')
+def build_recommendations(full, top_n, chunk_size, workers):
+    """Precompute top-N job recommendations for workers."""
+    from app.services.recommendations import run_recommendation_batch
+
+    generation = run_recommendation_batch(full=full, top_n=top_n, chunk_size=chunk_size, workers=workers)
+    click.echo(
+        f"Generation {generation.id}: {generation.worker_count} workers scored "
+        f"against {generation.job_count} open jobs"
+    )
+
+
+@translation_cli.command('invalidate')
+@click.argument('model_id')
+def invalidate_translations(model_id):
+    """Drop cached translations made by MODEL_ID (e.g. after a model upgrade)."""
+    from app.services.translation_cache import translation_cache
+
+    deleted = translation_cache.invalidate(model_id)
+    click.echo(f"Translation cache: {deleted} entries for {model_id} removed")
+
+
+@click.command('geo-backfill')
+@click.option('--target', 'targets', type=click.Choice(['jobs', 'users']), multiple=True,
+              help='Tables to backfill (default: both).')
+@click.option('--chunk-size', type=int, default=None, help='Rows read and written per batch.')
+@click.option('--workers', type=int, default=None, help='Concurrent geocoding threads.')
+@click.option('--rate', type=float, default=None, help='Upstream geocoder requests per second.')
+@click.option('--geocoder', default=None, help='Geocoder import path (defaults to GEOCODER).')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint and start from the first row.')
+@with_appcontext
+def geo_backfill(targets, chunk_size, workers, rate, geocoder, restart):
+    """Geocode free-text locations of jobs and users that lack coordinates."""
+    from app.services.geo_backfill import TARGETS, run_geo_backfill
+
+    def progress(target, last_id, totals, elapsed):
+        click.echo(
+            f"{target}: through id {last_id}, {totals['resolved']}/{totals['rows']} resolved, "
+            f"{totals['lookups']} lookups, {totals['rows'] / max(elapsed, 1e-9):.1f} rows/s"
+        )
+
+    stats = run_geo_backfill(
+        targets=targets or TARGETS, chunk_size=chunk_size, workers=workers, rate=rate,
+        geocoder=geocoder, restart=restart, progress=progress,
+    )
+    for target, totals in stats.items():
+        click.echo(
+            f"{target} done: {totals['resolved']} of {totals['rows']} rows geocoded, "
+            f"{totals['failed']} failed upstream (retried first next run)"
+        )
+
+
+def register_cli(app):
+    app.cli.add_command(matching_cli)
+    app.cli.add_command(density_cli)
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(translation_cli)
+    app.cli.add_command(geo_backfill)
@@ -1,3 +1,11 @@
-from .user import User, Job, JobApplication, Message
+from .user import (
+    User, Job, JobTag, JobApplication, Message, RecommendationGeneration, JobRecommendation,
+    UserProfileVector, GeocodeCache, JobDensityCell,
+    TranslationCacheEntry
+)
 
-__all__ = ['User', 'Job', 'JobApplication', 'Message']
+__all__ = [
+    'User', 'Job', 'JobTag', 'JobApplication', 'Message', 'RecommendationGeneration',
+    'JobRecommendation', 'UserProfileVector', 'GeocodeCache', 'JobDensityCell',
+    'TranslationCacheEntry'
+]
@@ -15,6 +15,11 @@ class User(UserMixin, db.Model):
     preferred_language = db.Column(db.String(20))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_seen = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped whenever skills or applications change; drives incremental recommendation batches
+    profile_updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    location = db.Column(db.String(200))
     
     # Relationships
     jobs = db.relationship('Job', backref='creator', lazy=True)
@@ -33,6 +38,12 @@ class User(UserMixin, db.Model):
                 return part
         return ''
 
+    @property
+    def is_admin(self) -> bool:
+        """Return whether this user's email is listed in ``ADMIN_EMAILS``."""
+        from flask import current_app
+        return (self.email or '').lower() in current_app.config.get('ADMIN_EMAILS', ())
+
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
     
@@ -55,13 +66,23 @@ class UserSkill(db.Model):
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        # Backs the open-jobs feeds' keyset pagination on (created_at, id)
+        db.Index('ix_jobs_status_created_at_id', 'status', 'created_at', 'id'),
+        # Nearby search scans geohash prefix ranges of open jobs
+        db.Index('ix_jobs_status_geohash', 'status', 'geohash'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     budget = db.Column(db.Float)
     location = db.Column(db.String(200))
-    status = db.Column(db.String(20), default='open')  # open, in_progress, completed
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    # active_history: the density counters need the old value even when it was expired
+    geohash = db.column_property(db.Column(db.String(12)), active_history=True)
+    status = db.column_property(db.Column(db.String(20), default='open'), active_history=True)  # open, in_progress, completed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Foreign Keys
@@ -70,10 +91,62 @@ class Job(db.Model):
     # Relationships
     applications = db.relationship('JobApplication', backref='job', lazy=True)
     messages = db.relationship('Message', backref='job', lazy=True)
+    tags = db.relationship('JobTag', backref='job', lazy='selectin', cascade='all, delete-orphan')
+    
+    def set_tags(self, raw_tags):
+        """Replace tags from a comma-separated string or an iterable of names"""
+        if isinstance(raw_tags, str):
+            raw_tags = raw_tags.split(',')
+        names = []
+        for tag in raw_tags or []:
+            tag = (tag or '').strip().lower()[:80]
+            if tag and tag not in names:
+                names.append(tag)
+        self.tags = [JobTag(tag=tag) for tag in names]
+    
+    def set_coordinates(self, latitude, longitude):
+        """Set lat/lng and the geohash cell that indexes them"""
+        from app.services.geo import geohash_encode
+        
+        if latitude is None or longitude is None:
+            self.latitude = self.longitude = self.geohash = None
+            return
+        self.latitude, self.longitude = float(latitude), float(longitude)
+        self.geohash = geohash_encode(self.latitude, self.longitude)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'budget': self.budget,
+            'location': self.location,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'status': self.status,
+            'tags': [tag.tag for tag in self.tags],
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'user_id': self.user_id
+        }
     
     def __repr__(self):
         return f'<Job {self.title}>'
 
+class JobTag(db.Model):
+    __tablename__ = 'job_tags'
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'tag', name='uq_job_tags_job_tag'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    tag = db.Column(db.String(80), nullable=False, index=True)
+    
+    # Foreign Keys
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<JobTag {self.tag}>'
+
 class JobApplication(db.Model):
     __tablename__ = 'job_applications'
     
@@ -104,3 +177,101 @@ class Message(db.Model):
     
     def __repr__(self):
         return f'<Message {self.id}>'
+
+class RecommendationGeneration(db.Model):
+    __tablename__ = 'recommendation_generations'
+
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    full = db.Column(db.Boolean, default=False)
+    worker_count = db.Column(db.Integer, default=0)
+    job_count = db.Column(db.Integer, default=0)
+
+    def __repr__(self):
+        return f'<RecommendationGeneration {self.id}>'
+
+class JobRecommendation(db.Model):
+    __tablename__ = 'job_recommendations'
+    __table_args__ = (
+        db.Index('ix_job_recommendations_user_rank', 'user_id', 'rank'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    rank = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+
+    # Foreign Keys
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
+    generation_id = db.Column(db.Integer, db.ForeignKey('recommendation_generations.id'), nullable=False)
+
+    def __repr__(self):
+        return f'<JobRecommendation user={self.user_id} job={self.job_id} #{self.rank}>'
+
+class UserProfileVector(db.Model):
+    __tablename__ = 'user_profile_vectors'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    vocabulary = db.Column(db.String(40), nullable=False)  # job index vocabulary fingerprint
+    profile_updated_at = db.Column(db.DateTime)
+    vector = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<UserProfileVector {self.user_id}>'
+
+class GeocodeCache(db.Model):
+    __tablename__ = 'geocode_cache'
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'key', name='uq_geocode_cache_kind_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)  # forward, reverse
+    key = db.Column(db.String(255), nullable=False)  # normalised address or rounded "lat,lng"
+    found = db.Column(db.Boolean, nullable=False, default=True)  # False caches a miss
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    address = db.Column(db.Text)  # JSON address components for reverse lookups
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<GeocodeCache {self.kind} {self.key}>'
+
+
+class JobDensityCell(db.Model):
+    """Job count per (geohash prefix, status), maintained incrementally"""
+    __tablename__ = 'job_density_cells'
+    __table_args__ = (
+        db.UniqueConstraint('cell', 'status', name='uq_job_density_cells_cell_status'),
+        db.Index('ix_job_density_cells_lookup', 'precision', 'status', 'latitude', 'longitude'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    precision = db.Column(db.SmallInteger, nullable=False)  # len(cell)
+    cell = db.Column(db.String(12), nullable=False)  # geohash prefix
+    status = db.Column(db.String(20), nullable=False)
+    latitude = db.Column(db.Float, nullable=False)  # cell centre
+    longitude = db.Column(db.Float, nullable=False)
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<JobDensityCell {self.cell} {self.status}={self.job_count}>'
+
+
+class TranslationCacheEntry(db.Model):
+    """Persisted machine translation, keyed by a hash of text, languages and model"""
+    __tablename__ = 'translation_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    key_hash = db.Column(db.String(64), nullable=False, unique=True)  # sha256 hex
+    model_id = db.Column(db.String(200), nullable=False, index=True)
+    source_lang = db.Column(db.String(10), nullable=False)
+    target_lang = db.Column(db.String(10), nullable=False)
+    translated_text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<TranslationCacheEntry {self.model_id} {self.source_lang}->{self.target_lang}>'
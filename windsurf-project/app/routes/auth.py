@@ -3,6 +3,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash
 from app.models.user import User, UserSkill
 from app import db
+from app.services.gazetteer import gazetteer
 from sqlalchemy import func
 import re
 
@@ -136,6 +137,13 @@ def register_worker():
             preferred_language=preferred_language
         )
         user.set_password(password)
+        
+        # Approximate home coordinates from the bundled gazetteer (no network)
+        user.location = f"{district}, {state}"
+        point = gazetteer.lookup(state, district)
+        if point:
+            user.latitude, user.longitude = point
+        
         db.session.add(user)
         db.session.flush()  # Get user.id before creating skills
         
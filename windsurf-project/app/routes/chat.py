@@ -90,6 +90,12 @@ def handle_send_message(data):
         'language': message.language
     }, room=f'job_{job_id}')
 
+@socketio.on('connect')
+def on_connect():
+    # Personal room for server pushes such as `location_resolved`
+    if current_user.is_authenticated:
+        join_room(f'user_{current_user.id}')
+
 @socketio.on('join')
 def on_join(data):
     job_id = data.get('job_id')
@@ -1,7 +1,17 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort
 from flask_login import login_required, current_user
 from app.models.user import User
-from app.models import Job, JobApplication
+from app.models import Job, JobApplication, JobRecommendation
+from app.services.profile_vectors import profile_vectors
+from app.services.matching import job_matching_service
+from app.services.search_index import search_index
+from app.services.search_cache import search_cache
+from app.services.typeahead import typeahead
+from app.services.gazetteer import gazetteer
+from app.services.job_events import on_job_changed
+from app.services.facet_index import facet_index, bitmap_from_ids, BUDGET_BANDS
+from app.services.text_features import normalize_text
+from app.services.pagination import encode_cursor, decode_cursor, keyset_page, page_limit, job_page_response
 from app import db
 from datetime import datetime
 from sqlalchemy import or_, and_
@@ -33,8 +43,14 @@ def create_job():
             location=location,
             user_id=current_user.id
         )
+        new_job.set_tags(data.get('tags', ''))
+        new_job.set_coordinates(data.get('latitude', type=float), data.get('longitude', type=float))
+        if new_job.latitude is None:
+            # District/state centroid from the bundled gazetteer
+            new_job.set_coordinates(*(gazetteer.resolve(new_job.location) or (None, None)))
         db.session.add(new_job)
         db.session.commit()
+        on_job_changed(new_job)
         flash('Job created successfully!', 'success')
         return redirect(url_for('jobs.view_job', job_id=new_job.id))
     return render_template('jobs/create.html')
@@ -69,43 +85,183 @@ def apply_to_job(job_id):
         message=request.form.get('message')
     )
     
+    current_user.profile_updated_at = datetime.utcnow()
     db.session.add(application)
     db.session.commit()
+    profile_vectors.invalidate(current_user.id)
     
     flash('Application submitted successfully!', 'success')
     return redirect(url_for('jobs.view_job', job_id=job_id))
 
-@jobs_bp.route('/search')
-@login_required
-def search_jobs():
-    query = request.args.get('query', '')
-    location = request.args.get('location', '')
+def _text_match(query):
+    return or_(Job.title.ilike(f'%{query}%'), Job.description.ilike(f'%{query}%'))
 
-    # Build base query
+def _search_page(query, location, cursor, limit):
+    """One page of open jobs matching ``query``/``location``: ``(ids, next_cursor)``"""
     jobs = Job.query.filter(Job.status == 'open')
 
+    # Ranked full-text match; ilike scan only if the index is unavailable
+    searched = search_index.filter(jobs, query, location)
+    if searched is not None:
+        jobs, rank = searched
+        jobs, next_cursor = keyset_page(
+            jobs, [rank, Job.id], cursor, limit, salt='jobs-search-ranked', descending=False
+        )
+        return [job.id for job in jobs], next_cursor
+
     # Apply filters
     if query:
-        jobs = jobs.filter(
-            or_(
-                Job.title.ilike(f'%{query}%'),
-                Job.description.ilike(f'%{query}%')
-            )
-        )
+        jobs = jobs.filter(_text_match(query))
 
     if location:
         jobs = jobs.filter(Job.location.ilike(f'%{location}%'))
 
-    jobs = jobs.order_by(Job.created_at.desc())
+    jobs, next_cursor = keyset_page(jobs, [Job.created_at, Job.id], cursor, limit, salt='jobs-search')
+    return [job.id for job in jobs], next_cursor
+
+@jobs_bp.route('/search')
+@login_required
+def search_jobs():
+    # Normalised once, so the cache key and the search agree on the input
+    query = normalize_text(request.args.get('query', ''))
+    location = normalize_text(request.args.get('location', ''))
+    cursor, limit = request.args.get('cursor'), page_limit()
+
+    # Popular searches are served from the result cache (job ids per page)
+    key = search_cache.key(query, location, cursor, limit)
+    try:
+        job_ids, next_cursor = search_cache.get_or_compute(
+            key, lambda: _search_page(query, location, cursor, limit)
+        )
+    except ValueError:
+        abort(400)
+
+    jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()} if job_ids else {}
+    jobs = [jobs[job_id] for job_id in job_ids if job_id in jobs]
+    return job_page_response('jobs/search.html', jobs, next_cursor)
+
+def _match_bitmap(query, ranked):
+    """Bitmap of every job matching ``query``; cached until jobs change, like search pages"""
+    def compute():
+        if ranked:
+            return bitmap_from_ids(search_index.matching_ids(query))
+        return bitmap_from_ids([job_id for job_id, in db.session.query(Job.id).filter(_text_match(query))])
 
-    return render_template('jobs/search.html', jobs=jobs.all())
+    # The version leads the key: get_or_compute only stores keys of the current version
+    return search_cache.get_or_compute((search_cache.version, 'facet-matches', query, ranked), compute)
+
+@jobs_bp.route('/facets')
+@login_required
+def faceted_search():
+    """A page of jobs plus district/budget/status counts, filters applied in SQL"""
+    query = normalize_text(request.args.get('query', ''))
+    filters = facet_index.normalize_filters({
+        'district': request.args.get('district'),
+        'budget': request.args.get('budget'),
+        'status': request.args.get('status', 'open'),
+    })
+    cursor, limit = request.args.get('cursor'), page_limit()
+
+    jobs = Job.query
+    if filters['status']:
+        jobs = jobs.filter(Job.status == filters['status'])
+    if filters['district']:
+        jobs = jobs.filter(Job.location.in_(facet_index.district_locations(filters['district'])))
+    if filters['budget']:
+        band = {label: (low, high) for label, low, high in BUDGET_BANDS}.get(filters['budget'])
+        if band is None:
+            return jsonify({'error': 'Invalid budget band'}), 400
+        low, high = band
+        if low is not None:
+            jobs = jobs.filter(Job.budget >= low)
+        if high is not None:
+            jobs = jobs.filter(Job.budget < high)
+
+    # Text matches become one more bitmap for the counts
+    within = None
+    try:
+        searched = search_index.filter(jobs, query, '') if query else None
+        if searched is not None:
+            jobs, rank = searched
+            within = _match_bitmap(query, ranked=True)
+            jobs, next_cursor = keyset_page(
+                jobs, [rank, Job.id], cursor, limit, salt='jobs-facets-ranked', descending=False
+            )
+        else:
+            if query:
+                jobs = jobs.filter(_text_match(query))
+                within = _match_bitmap(query, ranked=False)
+            jobs, next_cursor = keyset_page(jobs, [Job.created_at, Job.id], cursor, limit, salt='jobs-facets')
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    return jsonify({
+        'jobs': [job.to_dict() for job in jobs],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
+        'facets': facet_index.counts(filters, within=within)
+    })
+
+@jobs_bp.route('/typeahead')
+@login_required
+def typeahead_suggestions():
+    """Prefix completions for the search box: titles, skills and places"""
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 8, type=int), 1), typeahead.top_k)
+    if not prefix.strip():
+        return jsonify({kind: [] for kind in typeahead.KINDS})
+    return jsonify({
+        kind: [{'text': text, 'popularity': weight} for text, weight in typeahead.complete(prefix, kind, limit)]
+        for kind in typeahead.KINDS
+    })
 
 @jobs_bp.route('/matches')
 @login_required
 def job_matches():
-    # Basic fallback matching: show recent open jobs
-    jobs = Job.query.filter(Job.status == 'open').order_by(Job.created_at.desc()).all()
-    return render_template('jobs/matches.html', jobs=jobs)
+    cursor, limit = request.args.get('cursor'), page_limit()
+    try:
+        # Precomputed by `flask recommendations build`; rank is unique per user
+        recommended = Job.query.join(
+            JobRecommendation, JobRecommendation.job_id == Job.id
+        ).filter(
+            JobRecommendation.user_id == current_user.id,
+            Job.status == 'open'
+        )
+        if db.session.query(recommended.exists()).scalar():
+            jobs, next_cursor = keyset_page(
+                recommended, [JobRecommendation.rank], cursor, limit,
+                salt='jobs-matches', descending=False
+            )
+        else:
+            # Basic fallback matching: show recent open jobs
+            jobs, next_cursor = keyset_page(
+                Job.query.filter(Job.status == 'open'), [Job.created_at, Job.id],
+                cursor, limit, salt='jobs-matches-recent'
+            )
+    except ValueError:
+        abort(400)
+    return job_page_response('jobs/matches.html', jobs, next_cursor)
+
+@jobs_bp.route('/recommendations')
+@login_required
+def recommendations_api():
+    """Scored recommendations for mobile clients, paged with an opaque cursor"""
+    limit = page_limit()
+    try:
+        after = decode_cursor(request.args.get('cursor'), salt='job-recommendations')
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    results, next_after = job_matching_service.recommendation_page(current_user, limit=limit, after=after)
+    return jsonify({
+        'jobs': [{
+            **r['job'].to_dict(),
+            'score': round(r['score'], 6),
+            'matching_skills': r['matching_skills']
+        } for r in results],
+        'next_cursor': encode_cursor(next_after, salt='job-recommendations') if next_after else None,
+        'has_more': next_after is not None
+    })
 
 @jobs_bp.route('/<int:job_id>/applications')
 @login_required
@@ -152,8 +308,10 @@ def update_job_status(job_id):
     if status not in ['open', 'in_progress', 'completed', 'cancelled']:
         return jsonify({'error': 'Invalid status'}), 400
     
+    old_status = job.status
     job.status = status
     job.updated_at = datetime.utcnow()
     db.session.commit()
+    on_job_changed(job, old_status)
     
     return jsonify({'success': True})
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify, redirect, url_for, flash, session
 from flask_login import login_required, current_user
 from app.services.translation import translation_service
+from app.services.translation_cache import translation_cache
+from app.services.translation_batcher import translation_batcher
+from app.services.model_registry import model_registry
 from ..models import User, Message
 from .. import db
 
@@ -89,6 +92,39 @@ def get_supported_languages():
         'languages': translation_service.get_supported_languages()
     })
 
+@language_bp.route('/cache-stats')
+@login_required
+def translation_cache_stats():
+    """Translation cache hit/miss counters and memory use"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    return jsonify({
+        'success': True,
+        'cache': translation_cache.stats()
+    })
+
+@language_bp.route('/batch-stats')
+@login_required
+def translation_batch_stats():
+    """Translation micro-batching queue depths, batch sizes and p50/p99 latency"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    return jsonify({
+        'success': True,
+        'batching': translation_batcher.stats()
+    })
+
+@language_bp.route('/model-stats')
+@login_required
+def translation_model_stats():
+    """Loaded translation models, their resident size and evictions"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    return jsonify({
+        'success': True,
+        'registry': model_registry.stats()
+    })
+
 @language_bp.route('/ui-catalog/<lang>')
 def get_ui_catalog(lang):
     """Public endpoint to fetch UI translation catalog for a given language.
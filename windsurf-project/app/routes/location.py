@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from app.services.location import location_service
+from app.services.gazetteer import gazetteer
+from app.services.geocoding import geocoding_service
+from app.services.address_resolver import address_resolver
+from app.services.job_density import job_density, zoom_precision
 from app.models.user import User
 from app.models import Job
 from app import db
@@ -96,21 +100,16 @@ def update_location():
         return jsonify({'error': 'Latitude and longitude are required'}), 400
     
     try:
-        # Update user's location
+        # Commit the coordinates now; the address is resolved in the background
         current_user.latitude = float(latitude)
         current_user.longitude = float(longitude)
-        
-        # If address is not provided, try to get it from coordinates
-        if not address:
-            location_data = location_service.get_address(latitude, longitude)
-            if location_data:
-                address = location_data.get('display_name', '')
-        
         if address:
             current_user.location = address
-        
         db.session.commit()
         
+        if not address:
+            address_resolver.submit(current_user.id, current_user.latitude, current_user.longitude)
+        
         return jsonify({
             'success': True,
             'message': 'Location updated successfully',
@@ -118,46 +117,110 @@ def update_location():
                 'latitude': current_user.latitude,
                 'longitude': current_user.longitude,
                 'address': current_user.location
-            }
+            },
+            # When true, the address arrives later as a `location_resolved` Socket.IO event
+            'address_pending': not address
         })
     except Exception as e:
         logger.error(f"Error updating location: {str(e)}")
         db.session.rollback()
         return jsonify({'error': 'Failed to update location'}), 500
 
+@location_bp.route('/geocode-metrics')
+@login_required
+def geocode_metrics():
+    """Background reverse geocoding queue depth, outcomes and latency"""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized'}), 403
+    return jsonify({
+        'success': True,
+        'reverse_geocoding': address_resolver.metrics(),
+        'cache': {
+            'hits': geocoding_service.hits,
+            'misses': geocoding_service.misses,
+            'upstream_calls': geocoding_service.upstream_calls,
+            'in_flight': geocoding_service.flights.in_flight()
+        }
+    })
+
 @location_bp.route('/nearby-jobs')
 @login_required
 def get_nearby_jobs():
     """Get jobs near user's current location"""
-    # Get user's current location
-    if not all([current_user.latitude, current_user.longitude]):
-        return jsonify({'error': 'User location not available'}), 400
+    # Get user's current location, else approximate it from their district
+    latitude, longitude = current_user.latitude, current_user.longitude
+    if latitude is None or longitude is None:
+        point = gazetteer.resolve(current_user.location)
+        if point is None:
+            return jsonify({'error': 'User location not available'}), 400
+        latitude, longitude = point
     
     try:
         radius = float(request.args.get('radius', 10))  # Default 10km radius
         limit = int(request.args.get('limit', 20))  # Default 20 results
+        unit = request.args.get('unit', 'km').lower()
+        if unit not in ('km', 'miles'):
+            return jsonify({'error': 'Unit must be km or miles'}), 400
         
         nearby_jobs = location_service.get_nearby_jobs(
-            current_user.latitude,
-            current_user.longitude,
+            latitude,
+            longitude,
             radius_km=radius,
-            limit=limit
+            limit=limit,
+            unit=unit,
+            exact=request.args.get('exact') in ('1', 'true')
         )
         
         return jsonify({
             'success': True,
             'jobs': nearby_jobs,
             'current_location': {
-                'latitude': current_user.latitude,
-                'longitude': current_user.longitude,
-                'address': current_user.location
+                'latitude': latitude,
+                'longitude': longitude,
+                'address': current_user.location,
+                'approximate': current_user.latitude is None
             },
-            'search_radius_km': radius
+            'search_radius_km': radius,
+            'unit': unit
         })
     except Exception as e:
         logger.error(f"Error getting nearby jobs: {str(e)}")
         return jsonify({'error': 'Failed to get nearby jobs'}), 500
 
+@location_bp.route('/density')
+@login_required
+def job_density_cells():
+    """Job counts per geohash cell in a bounding box, for map views"""
+    try:
+        lat_min = float(request.args['min_lat'])
+        lat_max = float(request.args['max_lat'])
+        lng_min = float(request.args['min_lng'])
+        lng_max = float(request.args['max_lng'])
+    except (KeyError, ValueError):
+        return jsonify({'error': 'min_lat, max_lat, min_lng and max_lng are required'}), 400
+    if lat_min > lat_max or lng_min > lng_max:
+        return jsonify({'error': 'Invalid bounding box'}), 400
+    
+    precision = request.args.get('precision', type=int)
+    if precision is None:
+        precision = zoom_precision(request.args.get('zoom', 5, type=int), job_density.max_precision)
+    precision = max(1, min(precision, job_density.max_precision))
+    status = request.args.get('status', 'open')
+    
+    try:
+        cells = job_density.cells(lat_min, lat_max, lng_min, lng_max, precision, status=status)
+    except Exception as e:
+        logger.error(f"Error getting job density: {str(e)}")
+        return jsonify({'error': 'Failed to get job density'}), 500
+    
+    return jsonify({
+        'success': True,
+        'precision': precision,
+        'status': status,
+        'cells': cells,
+        'total': sum(cell['count'] for cell in cells)
+    })
+
 @location_bp.route('/initiate-call', methods=['POST'])
 @login_required
 def initiate_call():
@@ -1,7 +1,12 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, abort
 from flask_login import login_required, current_user
 from app.models.user import User, Job, JobApplication
+from app.services.gazetteer import gazetteer
+from app.services.job_events import on_job_changed
+from app.services.profile_vectors import profile_vectors
+from app.services.pagination import keyset_page, page_limit, job_page_response
 from app import db, socketio
+from datetime import datetime
 
 main = Blueprint('main', __name__)
 
@@ -25,8 +30,14 @@ def dashboard():
 @main.route('/jobs')
 @login_required
 def jobs():
-    jobs = Job.query.filter_by(status='open').all()
-    return render_template('jobs/list.html', jobs=jobs)
+    try:
+        jobs, next_cursor = keyset_page(
+            Job.query.filter_by(status='open'), [Job.created_at, Job.id],
+            request.args.get('cursor'), page_limit(), salt='jobs-list'
+        )
+    except ValueError:
+        abort(400)
+    return job_page_response('jobs/list.html', jobs, next_cursor)
 
 @main.route('/jobs/create', methods=['GET', 'POST'])
 @login_required
@@ -41,9 +52,15 @@ def create_job():
             location=data.get('location'),
             user_id=current_user.id
         )
+        new_job.set_tags(data.get('tags', ''))
+        new_job.set_coordinates(data.get('latitude', type=float), data.get('longitude', type=float))
+        if new_job.latitude is None:
+            # District/state centroid from the bundled gazetteer
+            new_job.set_coordinates(*(gazetteer.resolve(new_job.location) or (None, None)))
         
         db.session.add(new_job)
         db.session.commit()
+        on_job_changed(new_job)
         
         return redirect(url_for('main.jobs'))
     
@@ -67,8 +84,10 @@ def apply_to_job(job_id):
         message=request.form.get('message')
     )
     
+    current_user.profile_updated_at = datetime.utcnow()
     db.session.add(application)
     db.session.commit()
+    profile_vectors.invalidate(current_user.id)
     
     # Notify the job creator
     socketio.emit('new_application', {
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request,
 from flask_login import login_required, current_user
 from app.models.user import User
 from app.models import Job, JobApplication
+from app.services.job_events import on_job_changed
 from app import db
 
 payments_bp = Blueprint('payments', __name__)
@@ -61,8 +62,10 @@ def accept_offer(job_id, application_id):
     
     # Accept offer
     application.status = 'accepted'
+    old_status = job.status
     job.status = 'in_progress'
     db.session.commit()
+    on_job_changed(job, old_status)
     
     return jsonify({'success': True})
 
@@ -110,9 +113,11 @@ def complete_job(job_id):
         return jsonify({'error': 'No accepted application found for this job'}), 400
     
     # Complete job
+    old_status = job.status
     job.status = 'completed'
     job.completed_at = datetime.utcnow()
     db.session.commit()
+    on_job_changed(job, old_status)
     
     return jsonify({'success': True})
 
@@ -126,6 +131,7 @@ def cancel_job(job_id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     # Cancel job
+    old_status = job.status
     job.status = 'cancelled'
     job.cancelled_at = datetime.utcnow()
     
@@ -135,6 +141,7 @@ def cancel_job(job_id):
         app.status = 'cancelled'
     
     db.session.commit()
+    on_job_changed(job, old_status)
     
     return jsonify({'success': True})
 
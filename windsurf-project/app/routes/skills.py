@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
-from app.models.user import User
-from app.models import Job
+from app.models.user import User, UserSkill
+from app.models import Job, JobTag
 from app import db
+from app.services.profile_vectors import profile_vectors
+from app.services.typeahead import typeahead
+from datetime import datetime
 
 skills_bp = Blueprint('skills', __name__)
 
@@ -54,8 +57,10 @@ def add_skill():
         experience_years=experience_years
     )
     
+    current_user.profile_updated_at = datetime.utcnow()
     db.session.add(new_skill)
     db.session.commit()
+    profile_vectors.invalidate(current_user.id)
     
     return jsonify({
         'success': True,
@@ -82,8 +87,10 @@ def update_skill(skill_id):
     
     if experience_years is not None:
         skill.experience_years = experience_years
+        current_user.profile_updated_at = datetime.utcnow()
     
     db.session.commit()
+    profile_vectors.invalidate(current_user.id)
     
     return jsonify({
         'success': True,
@@ -105,8 +112,10 @@ def delete_skill(skill_id):
     if skill.user_id != current_user.id:
         return jsonify({'error': 'Unauthorized'}), 403
     
+    current_user.profile_updated_at = datetime.utcnow()
     db.session.delete(skill)
     db.session.commit()
+    profile_vectors.invalidate(current_user.id)
     
     return jsonify({
         'success': True,
@@ -122,23 +131,12 @@ def suggest_skills():
     if not query or len(query) < 2:
         return jsonify({'suggestions': []})
     
-    # Get popular skills that match the query
-    popular_skills = db.session.query(
-        JobTag.tag,
-        db.func.count(JobTag.tag).label('count')
-    ).filter(
-        JobTag.tag.ilike(f'%{query}%')
-    ).group_by(
-        JobTag.tag
-    ).order_by(
-        db.desc('count')
-    ).limit(10).all()
-    
     # Get user's existing skills to avoid duplicates
     user_skills = {skill.skill.lower() for skill in current_user.skills.all()}
     
+    # Popular tags completing the query, from the in-memory prefix index
     suggestions = []
-    for tag, count in popular_skills:
+    for tag, count in typeahead.complete(query, 'skills', typeahead.top_k):
         if tag.lower() not in user_skills:
             suggestions.append({
                 'skill': tag,
@@ -0,0 +1,143 @@
+import atexit
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.services.geocoding import GeocodingError, geocoding_service
+
+
+class AddressResolver:
+    """
+    Background reverse geocoding for user locations.
+
+    ``submit`` returns at once; a small thread pool resolves the address
+    through the cached, rate-limited geocoding service, retrying upstream
+    failures with jittered exponential backoff. The result is written to
+    ``users.location`` only if the user's coordinates are still the ones
+    that were queued, then pushed to the ``user_<id>`` Socket.IO room as
+    ``location_resolved``. Queue depth, outcome counts and submit-to-done
+    latency are kept for :meth:`metrics`.
+    """
+
+    def __init__(self, workers=2, retries=3, backoff=2.0, max_backoff=60.0, latency_window=1000):
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.app = None
+        self._pool = None
+        self._pending = 0
+        self._running = 0
+        self._counts = {'resolved': 0, 'not_found': 0, 'stale': 0, 'failed': 0, 'retries': 0}
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get('REVERSE_GEOCODE_WORKERS', self.workers)
+        self.retries = app.config.get('REVERSE_GEOCODE_RETRIES', self.retries)
+        self.backoff = app.config.get('REVERSE_GEOCODE_BACKOFF', self.backoff)
+        self.max_backoff = app.config.get('REVERSE_GEOCODE_MAX_BACKOFF', self.max_backoff)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='reverse-geocode')
+            return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def submit(self, user_id, latitude, longitude):
+        """Queue a reverse geocode of ``(latitude, longitude)`` for a user"""
+        with self._lock:
+            self._pending += 1
+        self._get_pool().submit(self._run, user_id, float(latitude), float(longitude), time.monotonic())
+
+    def _run(self, user_id, latitude, longitude, queued_at):
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        outcome = 'failed'
+        try:
+            with self.app.app_context():
+                outcome = self._resolve(user_id, latitude, longitude)
+        except Exception as e:
+            self.logger.error(f"Reverse geocoding failed for user {user_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._counts[outcome] += 1
+                self._latencies.append(time.monotonic() - queued_at)
+
+    def _reverse(self, latitude, longitude):
+        for attempt in range(self.retries + 1):
+            try:
+                return geocoding_service.reverse(latitude, longitude, strict=True)
+            except GeocodingError:
+                if attempt == self.retries:
+                    raise
+                with self._lock:
+                    self._counts['retries'] += 1
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def _resolve(self, user_id, latitude, longitude):
+        from app import db, socketio
+        from app.models import User
+
+        location_data = self._reverse(latitude, longitude)
+        address = (location_data or {}).get('display_name')
+        if not address:
+            return 'not_found'
+
+        # Skip the write if the user has moved since this lookup was queued
+        table = User.__table__
+        with db.engine.begin() as conn:
+            updated = conn.execute(
+                table.update()
+                .where(table.c.id == user_id, table.c.latitude == latitude, table.c.longitude == longitude)
+                .values(location=address)
+            ).rowcount
+        if not updated:
+            return 'stale'
+
+        socketio.emit('location_resolved', {
+            'latitude': latitude,
+            'longitude': longitude,
+            'address': address
+        }, room=f'user_{user_id}')
+        return 'resolved'
+
+    def metrics(self):
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=float)
+            metrics = {
+                'queue_depth': self._pending,
+                'in_progress': self._running,
+                'workers': self.workers,
+                **self._counts,
+            }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            metrics['latency_seconds'] = {
+                'p50': round(float(p50), 3),
+                'p95': round(float(p95), 3),
+                'p99': round(float(p99), 3),
+                'max': round(float(latencies.max()), 3),
+                'samples': int(len(latencies)),
+            }
+        return metrics
+
+
+# Global instance
+address_resolver = AddressResolver()
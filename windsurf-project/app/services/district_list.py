@@ -148,6 +148,14 @@ def get_state_districts_map(force_refresh: bool = False) -> Dict[str, List[str]]
     return data
 
 
+def get_local_state_districts_map() -> Dict[str, List[str]]:
+    """Static snapshot, last remote fetch or the bundled fallback; never hits the network"""
+    if isinstance(STATIC_DISTRICTS, dict) and STATIC_DISTRICTS:
+        return STATIC_DISTRICTS
+    data = _CACHE.get("data")
+    return data if isinstance(data, dict) else LOCAL_DISTRICTS
+
+
 def get_districts(state: str, force_refresh: bool = False) -> List[str]:
     if not isinstance(state, str) or not state.strip():
         return []
@@ -0,0 +1,164 @@
+import logging
+import threading
+
+import numpy as np
+
+from app.services.text_features import normalize_text
+
+# (label, low inclusive, high exclusive); None is open-ended
+BUDGET_BANDS = (
+    ('under_500', None, 500),
+    ('500_2000', 500, 2000),
+    ('2000_5000', 2000, 5000),
+    ('5000_20000', 5000, 20000),
+    ('20000_plus', 20000, None),
+)
+
+FACETS = ('district', 'budget', 'status')
+
+
+def budget_band(budget):
+    if budget is None:
+        return None
+    for label, low, high in BUDGET_BANDS:
+        if (low is None or budget >= low) and (high is None or budget < high):
+            return label
+    return None
+
+
+def district_of(location):
+    """First part of a "District, State" location"""
+    district = (location or '').split(',')[0].strip()
+    return district or None
+
+
+def bitmap_from_ids(job_ids):
+    """Python int with bit ``id`` set for every id"""
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    if not len(job_ids):
+        return 0
+    bits = np.zeros(int(job_ids.max()) + 1, dtype=bool)
+    bits[job_ids] = True
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+class FacetIndex:
+    """
+    Per-facet bitmaps over job ids for faceted search.
+
+    Every (facet, value) pair owns a Python int used as a bitset (bit ``i``
+    is job ``i``), so a filtered count is an AND of a few bitmaps and a
+    popcount, with no aggregate queries. Each facet's counts apply the
+    filters on the *other* facets, so selecting a district still shows every
+    district's count. Districts also map to the raw ``location`` strings
+    they came from, so filters translate to exact ``IN`` clauses in SQL.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._bitmaps = {facet: {} for facet in FACETS}
+        self._labels = {}
+        self._locations = {}
+        self._values = {}
+        self._built = False
+        self._lock = threading.Lock()
+
+    def _values_of(self, job):
+        district = district_of(job.location)
+        return {
+            'district': normalize_text(district) if district else None,
+            'budget': budget_band(job.budget),
+            'status': job.status,
+        }
+
+    def _set(self, job_id, values, location):
+        bit = 1 << job_id
+        for facet, value in values.items():
+            if value is not None:
+                bitmaps = self._bitmaps[facet]
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+        if values['district']:
+            self._labels.setdefault(values['district'], district_of(location))
+            self._locations.setdefault(values['district'], set()).add(location)
+        self._values[job_id] = values
+
+    def _clear(self, job_id):
+        values = self._values.pop(job_id, None)
+        if values is None:
+            return
+        mask = ~(1 << job_id)
+        for facet, value in values.items():
+            if value is not None:
+                self._bitmaps[facet][value] &= mask
+
+    def rebuild(self):
+        from app import db
+        from app.models import Job
+
+        with self._lock:
+            self._bitmaps = {facet: {} for facet in FACETS}
+            self._labels, self._locations, self._values = {}, {}, {}
+            for job in db.session.query(Job.id, Job.location, Job.budget, Job.status).yield_per(5000):
+                self._set(job.id, self._values_of(job), job.location)
+            self._built = True
+        self.logger.info(f"Facet index built over {len(self._values)} jobs")
+
+    def ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def add_job(self, job):
+        if not self._built:
+            return
+        with self._lock:
+            self._clear(job.id)
+            self._set(job.id, self._values_of(job), job.location)
+
+    update_job = add_job
+
+    def _filter_bitmap(self, filters, skip=None):
+        """AND of the selected values' bitmaps, ignoring facet ``skip``; ``None`` is "all" """
+        result = None
+        for facet, value in filters.items():
+            if facet == skip or not value:
+                continue
+            bitmap = self._bitmaps[facet].get(value, 0)
+            result = bitmap if result is None else result & bitmap
+        return result
+
+    def normalize_filters(self, filters):
+        return {
+            'district': normalize_text(filters.get('district')) or None,
+            'budget': filters.get('budget') or None,
+            'status': filters.get('status') or None,
+        }
+
+    def counts(self, filters, within=None):
+        """
+        ``{facet: {value: count}}`` for jobs matching ``filters`` (already
+        normalised) and, when given, the ``within`` bitmap (e.g. text matches).
+        """
+        self.ensure_built()
+        with self._lock:
+            counts = {}
+            for facet in FACETS:
+                scope = self._filter_bitmap(filters, skip=facet)
+                if within is not None:
+                    scope = within if scope is None else scope & within
+                facet_counts = {}
+                for value, bitmap in self._bitmaps[facet].items():
+                    count = (bitmap if scope is None else bitmap & scope).bit_count()
+                    if count:
+                        facet_counts[self._labels.get(value, value) if facet == 'district' else value] = count
+                counts[facet] = facet_counts
+        return counts
+
+    def district_locations(self, district):
+        """Raw ``Job.location`` values that belong to a district"""
+        self.ensure_built()
+        with self._lock:
+            return sorted(self._locations.get(normalize_text(district), ()))
+
+
+# Global instance
+facet_index = FacetIndex()
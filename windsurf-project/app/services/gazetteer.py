@@ -0,0 +1,114 @@
+import bisect
+import csv
+import logging
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from app.services.text_features import normalize_text
+
+DEFAULT_PATH = Path(__file__).resolve().parent / 'india_centroids.csv'
+
+
+def place_key(name):
+    """Normalised place name: NFC, case-folded, punctuation collapsed"""
+    return re.sub(r'[\W_]+', ' ', normalize_text(name)).strip()
+
+
+class Gazetteer:
+    """
+    Offline centroids for Indian states and districts.
+
+    Loaded from ``india_centroids.csv`` (written by
+    ``scripts/generate_india_districts.py --centroids``) into a sorted key
+    list with parallel float32 coordinate arrays, so a lookup is one binary
+    search and needs no network. Keys are ``state|district``, ``state|`` for
+    the state centroid and ``|district`` for district names that are unique
+    across states.
+    """
+
+    def __init__(self, path=None):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else DEFAULT_PATH
+        self._keys = []
+        self._lats = np.empty(0, dtype=np.float32)
+        self._lngs = np.empty(0, dtype=np.float32)
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        path = app.config.get('GAZETTEER_PATH')
+        if path:
+            self.path = Path(path)
+            self._loaded = False
+
+    def load(self):
+        entries, district_states = {}, {}
+        with open(self.path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                state, district = place_key(row['state']), place_key(row['district'])
+                point = (float(row['latitude']), float(row['longitude']))
+                entries[f"{state}|{district}"] = point
+                if district:
+                    district_states.setdefault(district, []).append(point)
+        for district, points in district_states.items():
+            if len(points) == 1:
+                entries[f"|{district}"] = points[0]
+
+        keys = sorted(entries)
+        with self._lock:
+            self._keys = keys
+            self._lats = np.array([entries[key][0] for key in keys], dtype=np.float32)
+            self._lngs = np.array([entries[key][1] for key in keys], dtype=np.float32)
+            self._loaded = True
+        self.logger.info(f"Gazetteer loaded: {len(keys)} keys from {self.path}")
+
+    def _find(self, key):
+        if not self._loaded:
+            self.load()
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return float(self._lats[i]), float(self._lngs[i])
+        return None
+
+    def lookup(self, state=None, district=None):
+        """
+        ``(latitude, longitude)`` of a district, falling back to the state
+        centroid (or a district unique across states), else ``None``.
+        """
+        state, district = place_key(state), place_key(district)
+        if state and district:
+            point = self._find(f"{state}|{district}")
+            if point:
+                return point
+        if district:
+            point = self._find(f"|{district}")
+            if point:
+                return point
+        if state:
+            return self._find(f"{state}|")
+        return None
+
+    def resolve(self, location):
+        """
+        Best-effort coordinates for a free-text location such as
+        "Kothrud, Pune, Maharashtra": the most specific part that names a
+        known district, else a known state.
+        """
+        parts = [part for part in (place_key(p) for p in (location or '').split(',')) if part]
+        if not parts:
+            return None
+        state = parts[-1] if self._find(f"{parts[-1]}|") else None
+        for part in parts:
+            if part == state:
+                continue
+            point = (state and self._find(f"{state}|{part}")) or self._find(f"|{part}")
+            if point:
+                return point
+        return self._find(f"{state}|") if state else None
+
+
+# Global instance
+gazetteer = Gazetteer()
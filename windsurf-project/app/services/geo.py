@@ -0,0 +1,97 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_MILE = 1.609344
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """
+    Great-circle distances in km from one point to arrays of points.
+
+    Fully vectorised; NaN coordinates yield NaN distances.
+    """
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(np.asarray(lats, dtype=np.float64)), np.radians(np.asarray(lngs, dtype=np.float64))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Geohash: interleaved longitude/latitude bisections, 5 bits per base32 char
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_BASE32_INDEX = {ch: i for i, ch in enumerate(_BASE32)}
+GEOHASH_PRECISION = 9
+KM_PER_DEGREE_LAT = 111.32
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        span, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (span[0] + span[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            span[0] = mid
+        else:
+            span[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def geohash_bounds(geohash):
+    """``(lat_min, lat_max, lng_min, lng_max)`` of a geohash cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for ch in geohash:
+        value = _BASE32_INDEX[ch]
+        for shift in range(4, -1, -1):
+            span = lng_range if even else lat_range
+            mid = (span[0] + span[1]) / 2
+            if value >> shift & 1:
+                span[0] = mid
+            else:
+                span[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def cell_size_deg(precision):
+    """``(lat_degrees, lng_degrees)`` spanned by one cell at ``precision``"""
+    lat_bits = 5 * precision // 2
+    lng_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def bounding_box(lat, lng, radius_km):
+    """``(lat_min, lat_max, lng_min, lng_max)`` enclosing a radius"""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    dlng = radius_km / (KM_PER_DEGREE_LAT * max(np.cos(np.radians(lat)), 1e-6))
+    return max(lat - dlat, -90.0), min(lat + dlat, 90.0), max(lng - dlng, -180.0), min(lng + dlng, 180.0)
+
+
+def covering_cells(lat, lng, radius_km, max_cells=16):
+    """
+    Geohash prefixes whose cells together cover the radius' bounding box,
+    at the finest precision that needs no more than ``max_cells`` cells.
+    """
+    lat_min, lat_max, lng_min, lng_max = bounding_box(lat, lng, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lng = cell_size_deg(precision)
+        rows = int(np.floor(lat_max / cell_lat) - np.floor(lat_min / cell_lat)) + 1
+        cols = int(np.floor(lng_max / cell_lng) - np.floor(lng_min / cell_lng)) + 1
+        if rows * cols <= max_cells:
+            break
+
+    cells = set()
+    for i in range(rows):
+        for j in range(cols):
+            cells.add(geohash_encode(
+                min(lat_min + i * cell_lat, lat_max), min(lng_min + j * cell_lng, lng_max), precision
+            ))
+    return sorted(cells)
@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from sqlalchemy import bindparam, select
+
+from app.services.geo import geohash_encode
+from app.services.geocoding import GeocodingError, GeocodingService
+
+logger = logging.getLogger(__name__)
+
+TARGETS = ('jobs', 'users')
+
+
+class GeoBackfill:
+    """
+    Fills in coordinates for jobs and users that only have a free-text
+    ``location``.
+
+    Rows missing coordinates are streamed in id order, ``chunk_size`` at a
+    time. Within a chunk, locations that normalise to the same address key
+    are geocoded once; resolved keys are also remembered across chunks and
+    the persistent geocode cache covers earlier runs. Unique addresses are
+    looked up by ``workers`` threads sharing one token bucket of ``rate``
+    requests per second, and each chunk is written back with a single
+    ``executemany`` update. The last finished id per target is checkpointed
+    to a JSON file, so an interrupted run resumes where it stopped. Rows
+    whose lookup failed upstream (as opposed to "not found") are kept on a
+    retry list in the checkpoint and processed first by the next run.
+    """
+
+    def __init__(self, service, checkpoint_path, chunk_size=500, workers=4, memo_size=100000):
+        self.service = service
+        self.checkpoint_path = checkpoint_path
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.memo_size = memo_size
+        self._memo = {}
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_checkpoint(self, checkpoint):
+        tmp = f"{self.checkpoint_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def reset(self):
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _table(self, target):
+        from app.models import Job, User
+
+        return (Job if target == 'jobs' else User).__table__
+
+    def _chunks(self, table, last_id):
+        """Yield ``[(id, location), ...]`` for rows without coordinates, in id order"""
+        from app import db
+
+        query = select(table.c.id, table.c.location).where(
+            table.c.latitude.is_(None),
+            table.c.location.isnot(None),
+            table.c.location != '',
+        ).order_by(table.c.id).limit(self.chunk_size)
+        while True:
+            with db.engine.connect() as conn:
+                rows = conn.execute(query.where(table.c.id > last_id)).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+    def _retry_rows(self, table, ids):
+        """Rows on the retry list that still have no coordinates"""
+        from app import db
+
+        if not ids:
+            return []
+        query = select(table.c.id, table.c.location).where(
+            table.c.id.in_(ids), table.c.latitude.is_(None)
+        ).order_by(table.c.id)
+        with db.engine.connect() as conn:
+            return conn.execute(query).all()
+
+    def _resolve(self, addresses):
+        """
+        ``({key: point or None}, failed_keys)`` for ``{key: address}``,
+        geocoding keys not seen yet. Upstream failures are not memoised.
+        """
+        from flask import current_app
+
+        points = {key: self._memo[key] for key in addresses if key in self._memo}
+        missing = [key for key in addresses if key not in points]
+        app = current_app._get_current_object()
+
+        def lookup(key):
+            with app.app_context():
+                try:
+                    return self.service.forward(addresses[key], strict=True), False
+                except GeocodingError:
+                    return None, True
+
+        failed = set()
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for key, (point, error) in zip(missing, pool.map(lookup, missing)):
+                    if error:
+                        failed.add(key)
+                    else:
+                        points[key] = point
+            resolved = [key for key in missing if key not in failed]
+            if len(self._memo) + len(resolved) > self.memo_size:
+                self._memo.clear()
+            self._memo.update((key, points[key]) for key in resolved)
+        return points, failed
+
+    def _write(self, table, updates):
+        from app import db
+
+        values = {
+            'latitude': bindparam('b_latitude'),
+            'longitude': bindparam('b_longitude'),
+        }
+        if 'geohash' in table.c:
+            values['geohash'] = bindparam('b_geohash')
+        statement = table.update().where(table.c.id == bindparam('b_id')).values(**values)
+        with db.engine.begin() as conn:
+            conn.execute(statement, updates)
+
+    def _process(self, table, rows):
+        """Geocode and write one batch; returns ``(resolved, failed_ids, lookups)``"""
+        addresses = {}
+        keys = []
+        for row in rows:
+            key = self.service.address_key(row.location)
+            keys.append(key)
+            if key:
+                addresses.setdefault(key, row.location)
+
+        calls_before = self.service.upstream_calls
+        points, failed = self._resolve(addresses)
+        updates, failed_ids = [], []
+        for row, key in zip(rows, keys):
+            if key in failed:
+                failed_ids.append(row.id)
+                continue
+            point = points.get(key)
+            if point:
+                lat, lng = point
+                update = {'b_id': row.id, 'b_latitude': lat, 'b_longitude': lng}
+                if 'geohash' in table.c:
+                    update['b_geohash'] = geohash_encode(lat, lng)
+                updates.append(update)
+        if updates:
+            self._write(table, updates)
+        return len(updates), failed_ids, self.service.upstream_calls - calls_before
+
+    def run(self, targets=TARGETS, progress=None):
+        """Backfill each target; returns ``{target: {'rows', 'resolved', 'lookups', 'failed'}}``"""
+        checkpoint = self._load_checkpoint()
+        stats = {}
+        for target in targets:
+            table = self._table(target)
+            retry_key = f"{target}_retry"
+            totals = {'rows': 0, 'resolved': 0, 'lookups': 0, 'failed': 0}
+            started = time.monotonic()
+
+            # Rows that failed upstream last time go first, then new rows
+            retry_ids = checkpoint.get(retry_key, [])
+            checkpoint[retry_key] = []
+            batches = chain(
+                ((True, self._retry_rows(table, retry_ids[i:i + self.chunk_size]))
+                 for i in range(0, len(retry_ids), self.chunk_size)),
+                ((False, rows) for rows in self._chunks(table, checkpoint.get(target, 0))),
+            )
+            for retry, rows in batches:
+                if not rows:
+                    continue
+                resolved, failed_ids, lookups = self._process(table, rows)
+                checkpoint[retry_key].extend(failed_ids)
+                if not retry:
+                    checkpoint[target] = rows[-1].id
+                self._save_checkpoint(checkpoint)
+                totals['rows'] += len(rows)
+                totals['resolved'] += resolved
+                totals['lookups'] += lookups
+                totals['failed'] += len(failed_ids)
+                if progress:
+                    progress(target, checkpoint.get(target, 0), totals, time.monotonic() - started)
+            stats[target] = totals
+            logger.info(
+                f"Geo backfill {target}: {totals['resolved']}/{totals['rows']} rows resolved, "
+                f"{len(checkpoint[retry_key])} queued for retry"
+            )
+        return stats
+
+
+def run_geo_backfill(targets=TARGETS, chunk_size=None, workers=None, rate=None,
+                     geocoder=None, restart=False, progress=None):
+    """Entry point for the CLI and external schedulers"""
+    from flask import current_app
+    from werkzeug.utils import import_string
+
+    config = current_app.config
+    geocoder = geocoder or config.get('GEOCODER')
+    if isinstance(geocoder, str):
+        geocoder = import_string(geocoder)()
+    checkpoint_path = config.get('GEO_BACKFILL_CHECKPOINT') or os.path.join(
+        current_app.instance_path, 'geo_backfill.json'
+    )
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+
+    # Own service instance: shares the geocode cache table, but paces
+    # upstream calls to this run's budget and waits instead of skipping
+    service = GeocodingService(
+        geocoder=geocoder,
+        ttl_days=config.get('GEOCODE_TTL_DAYS', 30),
+        negative_ttl_hours=config.get('GEOCODE_NEGATIVE_TTL_HOURS', 24),
+        rate=rate or config.get('GEOCODE_RATE_PER_SECOND', 1.0),
+        precision=config.get('GEOCODE_COORD_PRECISION', 4),
+        max_wait=None,
+    )
+    backfill = GeoBackfill(
+        service,
+        checkpoint_path,
+        chunk_size=chunk_size or config.get('GEO_BACKFILL_CHUNK_SIZE', 500),
+        workers=workers or config.get('GEO_BACKFILL_WORKERS', 4),
+    )
+    if restart:
+        backfill.reset()
+    stats = backfill.run(targets=targets, progress=progress)
+    if stats.get('jobs', {}).get('resolved'):
+        # Bulk writes bypass the incremental density counters
+        from app.services.job_density import job_density
+
+        job_density.rebuild()
+    return stats
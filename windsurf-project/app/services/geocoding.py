@@ -0,0 +1,214 @@
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import import_string
+
+from app.services.single_flight import SingleFlight
+from app.services.text_features import normalize_text
+
+
+class GeocodingError(Exception):
+    """The upstream failed or the rate-limit queue timed out; worth retrying"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate=1.0, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting up to ``timeout`` seconds; False if none came"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class NominatimGeocoder:
+    """Upstream geocoder backed by OpenStreetMap Nominatim (geopy)"""
+
+    def __init__(self, user_agent='kaamconnect', timeout=10):
+        from geopy.geocoders import Nominatim
+
+        self.geolocator = Nominatim(user_agent=user_agent, timeout=timeout)
+
+    def geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        location = self.geolocator.geocode(address)
+        return (location.latitude, location.longitude) if location else None
+
+    def reverse(self, latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
+        location = self.geolocator.reverse(f"{latitude}, {longitude}", exactly_one=True)
+        if not location:
+            return None
+        return dict(location.raw.get('address', {}), display_name=location.address)
+
+
+class GeocodingService:
+    """
+    Cached, rate-limited geocoding.
+
+    Lookups are keyed on the normalised address (forward) or coordinates
+    rounded to ``precision`` decimals (reverse; 4 is about 11 m) and stored
+    in ``geocode_cache`` with a TTL; misses are cached too, for a shorter
+    ``negative_ttl``. Upstream calls are paced by a token bucket (Nominatim
+    allows 1 request/second) and identical in-flight lookups are merged.
+    A caller gives up after ``max_wait`` seconds in the queue. Upstream
+    errors are logged and not cached; lookups return ``None`` for them, or
+    raise :class:`GeocodingError` with ``strict=True``.
+
+    The upstream is any object with ``geocode(address)`` and
+    ``reverse(lat, lng)``, configured by import path in ``GEOCODER``.
+    """
+
+    def __init__(self, geocoder=None, ttl_days=30, negative_ttl_hours=24, rate=1.0, precision=4, max_wait=5.0):
+        self.logger = logging.getLogger(__name__)
+        self._geocoder = geocoder
+        self.ttl = timedelta(days=ttl_days)
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self.precision = precision
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate=rate)
+        self.flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+
+    def init_app(self, app):
+        self.ttl = timedelta(days=app.config.get('GEOCODE_TTL_DAYS', self.ttl.days))
+        self.negative_ttl = timedelta(hours=app.config.get('GEOCODE_NEGATIVE_TTL_HOURS', 24))
+        self.precision = app.config.get('GEOCODE_COORD_PRECISION', self.precision)
+        self.max_wait = app.config.get('GEOCODE_MAX_WAIT', self.max_wait)
+        self.bucket = TokenBucket(rate=app.config.get('GEOCODE_RATE_PER_SECOND', self.bucket.rate))
+        geocoder = app.config.get('GEOCODER')
+        if geocoder and self._geocoder is None:
+            self._geocoder = import_string(geocoder)() if isinstance(geocoder, str) else geocoder
+
+    @property
+    def geocoder(self):
+        if self._geocoder is None:
+            self._geocoder = NominatimGeocoder()
+        return self._geocoder
+
+    @geocoder.setter
+    def geocoder(self, geocoder):
+        self._geocoder = geocoder
+
+    def address_key(self, address):
+        return re.sub(r'\s*,\s*', ', ', normalize_text(address)).strip(', ')[:255]
+
+    def point_key(self, latitude, longitude):
+        return f"{round(float(latitude), self.precision):.{self.precision}f},{round(float(longitude), self.precision):.{self.precision}f}"
+
+    def _read(self, kind, key):
+        from app import db
+        from app.models import GeocodeCache
+
+        table = GeocodeCache.__table__
+        with db.engine.connect() as conn:
+            return conn.execute(
+                table.select().where(table.c.kind == kind, table.c.key == key)
+            ).first()
+
+    def _write(self, kind, key, found, latitude=None, longitude=None, address=None):
+        from app import db
+        from app.models import GeocodeCache
+
+        table = GeocodeCache.__table__
+        now = datetime.utcnow()
+        values = {
+            'found': found,
+            'latitude': latitude,
+            'longitude': longitude,
+            'address': json.dumps(address, ensure_ascii=False) if address is not None else None,
+            'created_at': now,
+            'expires_at': now + (self.ttl if found else self.negative_ttl),
+        }
+        # Own transaction, so the caller's session is never committed here
+        try:
+            with db.engine.begin() as conn:
+                updated = conn.execute(
+                    table.update().where(table.c.kind == kind, table.c.key == key).values(**values)
+                ).rowcount
+                if not updated:
+                    conn.execute(table.insert().values(kind=kind, key=key, **values))
+        except IntegrityError:
+            pass  # Another process stored the same lookup first
+
+    def _lookup(self, kind, key, fetch, store, strict=False):
+        row = self._read(kind, key)
+        if row is not None and row.expires_at > datetime.utcnow():
+            self.hits += 1
+            return row
+        self.misses += 1
+        try:
+            return self.flights.do((kind, key), lambda: self._fetch(kind, key, fetch, store))
+        except GeocodingError as e:
+            self.logger.error(str(e))
+            if strict:
+                raise
+            return None
+
+    def _fetch(self, kind, key, fetch, store):
+        if not self.bucket.acquire(timeout=self.max_wait):
+            raise GeocodingError(f"Geocoding queue full, skipped {kind} lookup for {key}")
+        self.upstream_calls += 1
+        try:
+            result = fetch()
+        except Exception as e:
+            raise GeocodingError(f"Geocoding error ({kind} {key}): {str(e)}") from e
+        store(result)
+        return self._read(kind, key)
+
+    def forward(self, address: str, strict: bool = False) -> Optional[Tuple[float, float]]:
+        """``(latitude, longitude)`` for an address, or ``None``"""
+        key = self.address_key(address)
+        if not key:
+            return None
+
+        def store(point):
+            if point:
+                self._write('forward', key, True, latitude=point[0], longitude=point[1])
+            else:
+                self._write('forward', key, False)
+
+        row = self._lookup('forward', key, lambda: self.geocoder.geocode(address), store, strict)
+        if row is None or not row.found:
+            return None
+        return (row.latitude, row.longitude)
+
+    def reverse(self, latitude: float, longitude: float, strict: bool = False) -> Optional[Dict[str, Any]]:
+        """Address components for a coordinate, or ``None``"""
+        key = self.point_key(latitude, longitude)
+        lat, lng = (float(part) for part in key.split(','))
+
+        def store(address):
+            self._write('reverse', key, bool(address), latitude=lat, longitude=lng, address=address or None)
+
+        row = self._lookup('reverse', key, lambda: self.geocoder.reverse(lat, lng), store, strict)
+        if row is None or not row.found:
+            return None
+        return json.loads(row.address) if row.address else {}
+
+
+# Global instance
+geocoding_service = GeocodingService()
@@ -0,0 +1,169 @@
+import logging
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from app.services.geo import cell_size_deg, geohash_bounds
+
+
+def zoom_precision(zoom, max_precision=6, cells_per_tile=8):
+    """
+    Geohash precision for a web-map zoom level: the coarsest cells that
+    still put about ``cells_per_tile`` columns across one 256px tile.
+    """
+    target = 360.0 / 2 ** max(int(zoom), 0) / cells_per_tile
+    for precision in range(1, max_precision + 1):
+        if cell_size_deg(precision)[1] <= target:
+            return precision
+    return max_precision
+
+
+class JobDensity:
+    """
+    Job counts per geohash cell for map views.
+
+    ``job_density_cells`` holds one counter per (geohash prefix, status) for
+    every prefix length up to ``max_precision``, along with the cell centre.
+    A ``before_flush`` listener on the ORM session adjusts the counters of
+    every job it inserts, deletes or whose status or geohash changes, in the
+    same transaction as the job itself, so a bounding-box query at any zoom
+    level is an index range scan over pre-aggregated rows, never a scan of
+    jobs. Core writes bypass the listener; ``rebuild`` recomputes everything
+    from ``jobs.geohash`` after them (e.g. ``flask geo-backfill``).
+    """
+
+    def __init__(self, max_precision=6):
+        self.logger = logging.getLogger(__name__)
+        self.max_precision = max_precision
+
+    def init_app(self, app):
+        from sqlalchemy import event
+        from app import db
+
+        self.max_precision = app.config.get('JOB_DENSITY_MAX_PRECISION', self.max_precision)
+        if not event.contains(db.session, 'before_flush', self._before_flush):
+            event.listen(db.session, 'before_flush', self._before_flush)
+
+    def _cells(self, geohash):
+        return [geohash[:precision] for precision in range(1, min(self.max_precision, len(geohash)) + 1)]
+
+    def _row(self, cell, status, count):
+        lat_min, lat_max, lng_min, lng_max = geohash_bounds(cell)
+        return {
+            'precision': len(cell), 'cell': cell, 'status': status,
+            'latitude': (lat_min + lat_max) / 2, 'longitude': (lng_min + lng_max) / 2,
+            'job_count': count,
+        }
+
+    def _upsert(self, dialect, table, cell, status, delta):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(table).values(**self._row(cell, status, delta)).on_conflict_do_update(
+            index_elements=['cell', 'status'],
+            set_={'job_count': table.c.job_count + delta},
+        )
+
+    def _deltas(self, session):
+        """``{(geohash, status): delta}`` for the jobs this flush adds, changes or deletes"""
+        from sqlalchemy import inspect
+        from app.models import Job
+
+        deltas = Counter()
+        for job in session.new:
+            if isinstance(job, Job) and job.geohash:
+                deltas[(job.geohash, job.status or 'open')] += 1
+        for job in session.deleted:
+            if isinstance(job, Job) and job.geohash:
+                deltas[(job.geohash, job.status)] -= 1
+        for job in session.dirty:
+            if not isinstance(job, Job):
+                continue
+            attrs = inspect(job).attrs
+            geohash, status = attrs.geohash.history, attrs.status.history
+            if not (geohash.has_changes() or status.has_changes()):
+                continue
+            old_geohash = geohash.deleted[0] if geohash.deleted else job.geohash
+            old_status = status.deleted[0] if status.deleted else job.status
+            if old_geohash:
+                deltas[(old_geohash, old_status)] -= 1
+            if job.geohash:
+                deltas[(job.geohash, job.status)] += 1
+        return {key: delta for key, delta in deltas.items() if delta and key[1]}
+
+    def _before_flush(self, session, flush_context, instances):
+        from app.models import JobDensityCell
+
+        deltas = self._deltas(session)
+        if not deltas:
+            return
+        table = JobDensityCell.__table__
+        dialect = session.get_bind().dialect.name
+        # Runs inside the flush, so the counters commit or roll back with the jobs
+        for (geohash, status), delta in deltas.items():
+            for cell in self._cells(geohash):
+                if delta > 0 and dialect in ('postgresql', 'sqlite'):
+                    session.execute(self._upsert(dialect, table, cell, status, delta))
+                    continue
+                updated = session.execute(
+                    table.update()
+                    .where(table.c.cell == cell, table.c.status == status)
+                    .values(job_count=table.c.job_count + delta)
+                ).rowcount
+                if not updated and delta > 0:
+                    session.execute(table.insert().values(**self._row(cell, status, delta)))
+
+    def rebuild(self):
+        """Recount every cell from the jobs table; returns the number of rows written"""
+        from app import db
+        from app.models import Job, JobDensityCell
+
+        table = JobDensityCell.__table__
+        jobs = Job.__table__
+        rows = []
+        with db.engine.begin() as conn:
+            conn.execute(table.delete())
+            for precision in range(1, self.max_precision + 1):
+                cell = func.substr(jobs.c.geohash, 1, precision)
+                query = select(cell, jobs.c.status, func.count()).where(
+                    jobs.c.geohash.isnot(None), jobs.c.status.isnot(None)
+                ).group_by(cell, jobs.c.status)
+                rows.extend(self._row(prefix, status, count) for prefix, status, count in conn.execute(query))
+            if rows:
+                conn.execute(table.insert(), rows)
+        self.logger.info(f"Job density rebuilt: {len(rows)} cells up to precision {self.max_precision}")
+        return len(rows)
+
+    def cells(self, lat_min, lat_max, lng_min, lng_max, precision, status='open'):
+        """
+        ``[{'cell', 'latitude', 'longitude', 'bounds', 'count'}]`` for cells of
+        ``precision`` overlapping the bounding box.
+        """
+        from app import db
+        from app.models import JobDensityCell
+
+        precision = max(1, min(int(precision), self.max_precision))
+        # Match on cell centres, widened by half a cell so edge cells are kept
+        half_lat, half_lng = (size / 2 for size in cell_size_deg(precision))
+        table = JobDensityCell.__table__
+        query = select(table.c.cell, table.c.latitude, table.c.longitude, table.c.job_count).where(
+            table.c.precision == precision,
+            table.c.status == status,
+            table.c.latitude.between(lat_min - half_lat, lat_max + half_lat),
+            table.c.longitude.between(lng_min - half_lng, lng_max + half_lng),
+            table.c.job_count > 0,
+        )
+        with db.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        return [{
+            'cell': row.cell,
+            'latitude': row.latitude,
+            'longitude': row.longitude,
+            'bounds': geohash_bounds(row.cell),
+            'count': row.job_count,
+        } for row in rows]
+
+
+# Global instance
+job_density = JobDensity()
@@ -0,0 +1,20 @@
+from app.services.facet_index import facet_index
+from app.services.job_index import job_index
+from app.services.search_cache import search_cache
+from app.services.tag_index import tag_index
+from app.services.typeahead import typeahead
+
+
+def on_job_changed(job, old_status=None):
+    """
+    Bring the in-process job indexes and caches up to date after a job was
+    created (``old_status`` is ``None``) or its status changed. Call after
+    the commit; density counters are already updated inside it.
+    """
+    job_index.update_job(job)
+    tag_index.update_job(job)
+    facet_index.update_job(job)
+    if old_status is None:
+        # Typeahead counts term occurrences, so only new jobs are added
+        typeahead.add_job(job)
+    search_cache.bump()
@@ -0,0 +1,331 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.services.ann import RandomProjectionLSH
+from app.services.text_features import TfidfTextEngine, make_engine
+
+
+# Numeric per-job columns kept alongside each row for vectorised ranking
+COLUMNS = ('budget', 'latitude', 'longitude')
+
+
+def job_columns(job):
+    """Column values for a job, NaN where unknown"""
+    values = []
+    for name in COLUMNS:
+        value = getattr(job, name, None)
+        values.append(np.nan if value is None else float(value))
+    return values
+
+
+def job_text(job):
+    """Build the text that represents a job in the index"""
+    tags = ' '.join([tag.tag for tag in job.tags])
+    text = f"{job.title} {job.description} {tags}"
+    return text.lower()
+
+
+class JobIndex:
+    """
+    Long-lived vector index over all open jobs.
+
+    Holds a text engine (a fitted TF-IDF vocabulary, or the stateless hashing
+    engine when ``MATCHING_VECTORIZER = 'hashing'``) and a CSR matrix with one
+    L2-normalised row per open job, so scoring a profile against the corpus
+    is a single sparse dot product. Rows are added, replaced and removed as
+    jobs change; the engine itself is only refit (or, for hashing, its IDF
+    reloaded) on a schedule or via ``flask matching refit-index``.
+
+    Each row also carries the numeric ``COLUMNS`` (budget, coordinates) as
+    parallel arrays so ranking never touches ORM attributes.
+
+    Nearest-neighbour lookups go through a random-projection LSH kept in step
+    with the rows; corpora up to ``exact_threshold`` open jobs are scored
+    exhaustively instead, as is any probe returning fewer than
+    ``ann_oversample`` candidates per requested neighbour (recall would
+    suffer) or more than ``ann_max_fraction`` of the open jobs (exact
+    scoring is then no slower).
+    """
+
+    def __init__(self, refit_interval=3600, exact_threshold=5000, ann_oversample=20, ann_max_fraction=0.5):
+        self.logger = logging.getLogger(__name__)
+        self.refit_interval = refit_interval
+        self.exact_threshold = exact_threshold
+        self.ann_oversample = ann_oversample
+        self.ann_max_fraction = ann_max_fraction
+        self.ann_params = {}
+        self.ann = RandomProjectionLSH()
+        self.engine = TfidfTextEngine()
+        self.version = 0
+        # Row numbers are stable (append-only) within one epoch
+        self.epoch = 0
+        self.fitted_at = None
+        self._built = False
+
+        self._lock = threading.RLock()
+        self._matrix = None
+        self._job_ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._columns = np.empty((0, len(COLUMNS)))
+        self._rows = {}
+        self._pending_ids = []
+        self._pending_vecs = []
+        self._pending_cols = []
+        self._journal = None
+        self._scheduler = None
+
+    def init_app(self, app):
+        self.refit_interval = app.config.get('JOB_INDEX_REFIT_INTERVAL', self.refit_interval)
+        self.exact_threshold = app.config.get('SIMILAR_JOBS_EXACT_THRESHOLD', self.exact_threshold)
+        self.ann_oversample = app.config.get('SIMILAR_JOBS_ANN_OVERSAMPLE', self.ann_oversample)
+        self.ann_max_fraction = app.config.get('SIMILAR_JOBS_ANN_MAX_FRACTION', self.ann_max_fraction)
+        self.ann_params = {
+            'n_tables': app.config.get('SIMILAR_JOBS_ANN_TABLES', 24),
+            'n_bits': app.config.get('SIMILAR_JOBS_ANN_BITS', 6),
+            'probes': app.config.get('SIMILAR_JOBS_ANN_PROBES', 2),
+        }
+        self.engine = make_engine(
+            app.config.get('MATCHING_VECTORIZER', 'tfidf'),
+            n_features=app.config.get('HASHING_N_FEATURES', 2 ** 20),
+            idf_path=app.config.get('HASHING_IDF_PATH'),
+        )
+        if self.refit_interval and self._scheduler is None:
+            self._scheduler = threading.Thread(
+                target=self._refit_loop, args=(app,), name='job-index-refit', daemon=True
+            )
+            self._scheduler.start()
+
+    def _refit_loop(self, app):
+        while True:
+            time.sleep(self.refit_interval)
+            if not self.is_built:
+                continue
+            with app.app_context():
+                try:
+                    self.refit()
+                except Exception as e:
+                    self.logger.error(f"Scheduled job index refit failed: {str(e)}")
+
+    @property
+    def is_built(self):
+        return self._built
+
+    @property
+    def fingerprint(self):
+        """Identifies the feature space; stable across processes, unlike ``version``"""
+        return self.engine.fingerprint
+
+    def ensure_built(self):
+        if not self.is_built:
+            self.refit()
+
+    def refit(self):
+        """Refit the vocabulary on all open jobs and rebuild every row"""
+        from app.models import Job
+
+        with self._lock:
+            self._journal = []
+
+        try:
+            jobs = Job.query.filter(Job.status == 'open').all()
+            engine, matrix = self.engine.fitted([job_text(job) for job in jobs])
+            job_ids = np.array([job.id for job in jobs], dtype=np.int64)
+            columns = np.array([job_columns(job) for job in jobs], dtype=np.float64).reshape(-1, len(COLUMNS))
+            ann = RandomProjectionLSH(**self.ann_params)
+            ann.build(matrix)
+
+            with self._lock:
+                journal, self._journal = self._journal, None
+                self.engine = engine
+                self._built = True
+                self._matrix = matrix
+                self.ann = ann
+                self._job_ids = job_ids
+                self._alive = np.ones(len(job_ids), dtype=bool)
+                self._columns = columns
+                self._rows = {int(job_id): row for row, job_id in enumerate(job_ids)}
+                self._pending_ids = []
+                self._pending_vecs = []
+                self._pending_cols = []
+                # Replay changes that raced with the refit query
+                for job_id, text, cols in journal:
+                    self._put(job_id, text, cols)
+                self.version += 1
+                self.epoch += 1
+                self.fitted_at = time.time()
+        finally:
+            with self._lock:
+                self._journal = None
+
+        self.logger.info(f"Job index refit on {len(job_ids)} open jobs (version {self.version})")
+        return True
+
+    def add_job(self, job):
+        """Add or replace the row for ``job``; non-open jobs are removed"""
+        if job.status != 'open':
+            return self.remove_job(job.id)
+        text, cols = job_text(job), job_columns(job)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((job.id, text, cols))
+            if self.is_built:
+                self._put(job.id, text, cols)
+
+    update_job = add_job
+
+    def remove_job(self, job_id):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((job_id, None, None))
+            if self.is_built:
+                self._put(job_id, None)
+
+    def _put(self, job_id, text, cols=None):
+        row = self._rows.pop(int(job_id), None)
+        if row is not None:
+            if row < len(self._alive):
+                self._alive[row] = False
+            else:
+                self._pending_ids[row - len(self._alive)] = -1
+        if text is None:
+            return
+        self._rows[int(job_id)] = len(self._alive) + len(self._pending_ids)
+        self._pending_ids.append(int(job_id))
+        self._pending_vecs.append(self.engine.transform([text]))
+        self._pending_cols.append(cols)
+
+    def _flush(self):
+        """Fold pending rows into the CSR matrix (caller holds the lock)"""
+        if not self._pending_ids:
+            return
+        pending_ids = np.array(self._pending_ids, dtype=np.int64)
+        pending = sp.vstack(self._pending_vecs, format='csr')
+        self._matrix = sp.vstack([self._matrix, pending], format='csr')
+        self.ann.append(pending)
+        self._job_ids = np.concatenate([self._job_ids, pending_ids])
+        self._alive = np.concatenate([self._alive, pending_ids >= 0])
+        self._columns = np.vstack([self._columns, np.array(self._pending_cols, dtype=np.float64)])
+        self._pending_ids = []
+        self._pending_vecs = []
+        self._pending_cols = []
+
+        # Drop dead rows once they make up half the matrix
+        if len(self._alive) and self._alive.sum() * 2 < len(self._alive):
+            self._matrix = self._matrix[self._alive]
+            self._job_ids = self._job_ids[self._alive]
+            self._columns = self._columns[self._alive]
+            self._alive = np.ones(len(self._job_ids), dtype=bool)
+            self._rows = {int(job_id): row for row, job_id in enumerate(self._job_ids)}
+            self.ann.build(self._matrix)
+            self.epoch += 1
+
+    def snapshot(self):
+        """Return ``(matrix, job_ids, alive)`` for lock-free read access"""
+        self.ensure_built()
+        with self._lock:
+            self._flush()
+            return self._matrix, self._job_ids, self._alive
+
+    def rows_for(self, job_ids):
+        """Return ``(matrix, rows, epoch)``; rows are -1 for jobs outside the index"""
+        self.ensure_built()
+        with self._lock:
+            self._flush()
+            rows = np.array([self._rows.get(job_id, -1) for job_id in job_ids], dtype=np.int64)
+            return self._matrix, rows, self.epoch
+
+    def locate(self, job_ids):
+        """
+        Row numbers and numeric columns for the indexed subset of ``job_ids``.
+
+        Returns ``(job_ids, rows, columns, matrix, epoch)`` where ``columns``
+        maps each name in ``COLUMNS`` to an array aligned with the returned
+        ids and ``rows`` index into ``matrix`` without copying it.
+        """
+        self.ensure_built()
+        job_ids = np.asarray(job_ids, dtype=np.int64)
+        with self._lock:
+            self._flush()
+            rows = np.array([self._rows.get(int(job_id), -1) for job_id in job_ids], dtype=np.int64)
+            keep = rows >= 0
+            rows = rows[keep]
+            matrix, values, epoch = self._matrix, self._columns[rows], self.epoch
+        return job_ids[keep], rows, {name: values[:, i] for i, name in enumerate(COLUMNS)}, matrix, epoch
+
+    def gather(self, job_ids):
+        """Like :meth:`locate`, but returns ``(job_ids, vectors, columns)``"""
+        job_ids, rows, columns, matrix, _ = self.locate(job_ids)
+        return job_ids, matrix[rows], columns
+
+    def transform(self, texts):
+        self.ensure_built()
+        return self.engine.transform(texts)
+
+    def vectors_for(self, jobs):
+        """Return a CSR matrix with one row per job, in the given order"""
+        self.ensure_built()
+        with self._lock:
+            self._flush()
+            matrix = self._matrix
+            rows = [self._rows.get(job.id, -1) for job in jobs]
+        rows = np.array(rows, dtype=np.int64)
+        missing = np.flatnonzero(rows < 0)
+        if not len(missing):
+            return matrix[rows]
+
+        # Jobs outside the index (e.g. closed ones) are vectorised on the fly
+        extra = self.transform([job_text(jobs[i]) for i in missing])
+        present = np.flatnonzero(rows >= 0)
+        stacked = sp.vstack([matrix[rows[present]], extra], format='csr')
+        order = np.empty(len(jobs), dtype=np.int64)
+        order[present] = np.arange(len(present))
+        order[missing] = len(present) + np.arange(len(missing))
+        return stacked[order]
+
+    def score(self, vec):
+        """Score ``vec`` against every open job: returns ``(job_ids, scores)``"""
+        matrix, job_ids, alive = self.snapshot()
+        scores = np.asarray((matrix @ vec.T).todense()).ravel()
+        return job_ids[alive], scores[alive]
+
+    def nearest(self, vec, limit, exclude=None):
+        """
+        Candidate neighbours of ``vec`` among open jobs.
+
+        Returns ``(job_ids, scores)`` for the LSH candidates, or for every
+        open job when the corpus is small or the probe came back with too
+        few or too many candidates.
+        """
+        self.ensure_built()
+        with self._lock:
+            self._flush()
+            matrix, job_ids, alive = self._matrix, self._job_ids, self._alive
+            n_open = int(alive.sum())
+            rows = None
+            if n_open > self.exact_threshold:
+                rows = self.ann.candidates(vec)
+                rows = rows[alive[rows]]
+                if not limit * self.ann_oversample <= len(rows) <= n_open * self.ann_max_fraction:
+                    rows = None
+            if rows is None:
+                # Exact fallback
+                rows = np.flatnonzero(alive)
+
+        ids = job_ids[rows]
+        if exclude is not None:
+            keep = ids != exclude
+            rows, ids = rows[keep], ids[keep]
+        scores = np.asarray((matrix[rows] @ vec.T).todense()).ravel()
+        return ids, scores
+
+    @property
+    def vocabulary_size(self):
+        return self.engine.n_features if self.is_built else 0
+
+
+# Global instance
+job_index = JobIndex()
@@ -1,12 +1,15 @@
 from geopy.distance import geodesic
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 import logging
+import numpy as np
 from typing import Optional, Tuple, Dict, Any
 
+from app.services.geocoding import geocoding_service
+from app.services.geo import KM_PER_MILE, covering_cells, haversine_km
+
+DISTANCE_UNITS = {'km': 1.0, 'miles': 1.0 / KM_PER_MILE}
+
 class LocationService:
     def __init__(self):
-        self.geolocator = Nominatim(user_agent="kaamconnect")
         self.logger = logging.getLogger(__name__)
     
     def get_coordinates(self, address: str) -> Optional[Tuple[float, float]]:
@@ -19,14 +22,8 @@ class LocationService:
         Returns:
             Optional[Tuple[float, float]]: (latitude, longitude) if found, None otherwise
         """
-        try:
-            location = self.geolocator.geocode(address)
-            if location:
-                return (location.latitude, location.longitude)
-            return None
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
-            self.logger.error(f"Geocoding error for address {address}: {str(e)}")
-            return None
+        # Cached and paced to the upstream's rate limit
+        return geocoding_service.forward(address)
     
     def get_address(self, latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
         """
@@ -39,14 +36,8 @@ class LocationService:
         Returns:
             Optional[Dict]: Address components if found, None otherwise
         """
-        try:
-            location = self.geolocator.reverse(f"{latitude}, {longitude}", exactly_one=True)
-            if location:
-                return location.raw.get('address', {})
-            return None
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
-            self.logger.error(f"Reverse geocoding error for ({latitude}, {longitude}): {str(e)}")
-            return None
+        # Cached per ~11 m cell and paced to the upstream's rate limit
+        return geocoding_service.reverse(latitude, longitude)
     
     def calculate_distance(
         self, 
@@ -66,86 +57,120 @@ class LocationService:
             Optional[float]: Distance in specified unit, or None if calculation fails
         """
         try:
-            distance = geodesic(coord1, coord2).kilometers
-            if unit.lower() == 'miles':
-                return distance * 0.621371  # Convert km to miles
-            return distance
+            return geodesic(coord1, coord2).kilometers * DISTANCE_UNITS.get(unit.lower(), 1.0)
         except Exception as e:
             self.logger.error(f"Distance calculation error: {str(e)}")
             return None
     
+    def calculate_distances(
+        self,
+        origin: Tuple[float, float],
+        latitudes,
+        longitudes,
+        unit: str = 'km'
+    ) -> np.ndarray:
+        """
+        Haversine distances from one point to arrays of coordinates in a
+        single NumPy pass (NaN where a coordinate is missing)
+        
+        Args:
+            origin (Tuple[float, float]): (latitude, longitude) to measure from
+            latitudes: Array-like of latitudes
+            longitudes: Array-like of longitudes
+            unit (str): 'km' for kilometers, 'miles' for miles
+            
+        Returns:
+            np.ndarray: Distances in the specified unit
+        """
+        km = haversine_km(origin[0], origin[1], latitudes, longitudes)
+        return km * DISTANCE_UNITS[unit.lower()]
+    
+    def refine_distances(
+        self,
+        origin: Tuple[float, float],
+        latitudes,
+        longitudes,
+        unit: str = 'km'
+    ) -> np.ndarray:
+        """Exact ellipsoidal (geodesic) distances; use on short, final lists only"""
+        factor = DISTANCE_UNITS[unit.lower()]
+        return np.array([
+            geodesic(origin, (lat, lng)).kilometers * factor
+            for lat, lng in zip(latitudes, longitudes)
+        ])
+    
     def get_nearby_jobs(
         self, 
         latitude: float, 
         longitude: float, 
         radius_km: float = 10.0,
-        limit: int = 20
+        limit: int = 20,
+        unit: str = 'km',
+        exact: bool = False
     ) -> list:
         """
         Find jobs within a certain radius of given coordinates
         
+        Only open jobs in the geohash cells covering the radius are read
+        (id and coordinates only); exact distances are computed in one
+        vectorised pass and just the closest ``limit`` jobs are loaded.
+        With ``exact`` those final jobs get geodesic distances and are
+        re-sorted (haversine is within ~0.5% of them).
+        
         Args:
             latitude (float): Center point latitude
             longitude (float): Center point longitude
             radius_km (float): Search radius in kilometers
             limit (int): Maximum number of results to return
+            unit (str): Unit of the returned distances, 'km' or 'miles'
+            exact (bool): Refine the returned distances with geodesic
             
         Returns:
-            list: List of nearby jobs with distance information
+            list: Nearby jobs closest first, each with ``distance`` and
+            ``distance_<unit>`` in the requested unit
         """
         from app import db
         from app.models import Job
-        from sqlalchemy import func, text
+        from sqlalchemy import and_, or_
         
         try:
-            # Convert radius from km to degrees (approximate)
-            radius_deg = radius_km / 111.0
-            
-            # Calculate bounding box for initial filtering
-            lat_min = latitude - radius_deg
-            lat_max = latitude + radius_deg
-            lng_min = longitude - (radius_deg / abs(cos(radians(latitude))))
-            lng_max = longitude + (radius_deg / abs(cos(radians(latitude))))
-            
-            # First filter by bounding box for performance
-            nearby_jobs = Job.query.filter(
+            # Each covering cell is a prefix, i.e. a range scan on the geohash index
+            cells = covering_cells(latitude, longitude, radius_km)
+            candidates = db.session.query(Job.id, Job.latitude, Job.longitude).filter(
                 Job.status == 'open',
-                Job.latitude.between(lat_min, lat_max),
-                Job.longitude.between(lng_min, lng_max)
+                or_(*[and_(Job.geohash >= cell, Job.geohash < cell + '~') for cell in cells])
             ).all()
+            if not candidates:
+                return []
             
-            # Calculate exact distances and filter by radius
-            results = []
-            for job in nearby_jobs:
-                if job.latitude and job.longitude:
-                    distance = self.calculate_distance(
-                        (latitude, longitude),
-                        (job.latitude, job.longitude)
-                    )
-                    
-                    if distance is not None and distance <= radius_km:
-                        job_dict = job.to_dict()
-                        job_dict['distance_km'] = distance
-                        results.append(job_dict)
+            job_ids, lats, lngs = (np.array(column) for column in zip(*candidates))
+            lats, lngs = lats.astype(np.float64), lngs.astype(np.float64)
+            distances = self.calculate_distances((latitude, longitude), lats, lngs)
+            inside = np.flatnonzero(distances <= radius_km)
+            closest = inside[np.argsort(distances[inside], kind='stable')][:limit]
+            
+            factor = DISTANCE_UNITS[unit.lower()]
+            if exact:
+                refined = self.refine_distances((latitude, longitude), lats[closest], lngs[closest])
+                order = np.argsort(refined, kind='stable')
+                closest, shown = closest[order], refined[order] * factor
+            else:
+                shown = distances[closest] * factor
             
-            # Sort by distance and limit results
-            results.sort(key=lambda x: x['distance_km'])
-            return results[:limit]
+            jobs = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids[closest].tolist())).all()}
+            results = []
+            for i, distance in zip(closest, shown):
+                job = jobs.get(int(job_ids[i]))
+                if job is not None:
+                    job_dict = job.to_dict()
+                    job_dict['distance'] = float(distance)
+                    job_dict[f'distance_{unit.lower()}'] = float(distance)
+                    results.append(job_dict)
+            return results
             
         except Exception as e:
             self.logger.error(f"Error finding nearby jobs: {str(e)}")
             return []
 
-# Helper functions
-def radians(degrees):
-    """Convert degrees to radians"""
-    from math import pi
-    return degrees * (pi / 180)
-
-def cos(radians):
-    """Cosine function that works with degrees"""
-    from math import cos as math_cos
-    return math_cos(radians)
-
 # Global instance
 location_service = LocationService()
@@ -1,49 +1,53 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import MinMaxScaler
 import numpy as np
 from app.models import Job, User, JobApplication
+from app.services.job_index import job_index, job_text
+from app.services.profile_vectors import profile_vectors
+from app.services.sharded_scoring import sharded_scorer
+from app.services.tag_index import tag_index
+from app.services.ranking import hybrid_ranker
 from app import db
 import logging
+import threading
+from collections import OrderedDict
 
 class JobMatchingService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+        self.index = job_index
+        self.sharded = sharded_scorer
+        self.tags = tag_index
+        self.ranker = hybrid_ranker
         self.scaler = MinMaxScaler()
+        # Per-user ranked score vectors behind recommendation_page
+        self.page_cache_size = 64
+        self._page_cache = OrderedDict()
+        self._page_lock = threading.Lock()
+    
+    def init_app(self, app):
+        self.page_cache_size = app.config.get('RECOMMENDATION_PAGE_CACHE_SIZE', self.page_cache_size)
         
     def get_job_features(self, job):
         """Extract features from a job post"""
         # Combine title, description, and tags into a single text
-        tags = ' '.join([tag.tag for tag in job.tags])
-        text = f"{job.title} {job.description} {tags}"
-        return text.lower()
+        return job_text(job)
     
     def get_user_features(self, user):
         """Extract features from a user's profile"""
-        # Get user's skills and experience
+        # Get user's skills and experience; application history is folded in
+        # as precomputed job rows by the profile vector cache
         skills = ' '.join([f"{skill.skill} " * (skill.experience_years or 1) 
                           for skill in user.skills])
-        
-        # Get user's previous job applications for context
-        applications = JobApplication.query.filter_by(user_id=user.id).all()
-        job_ids = [app.job_id for app in applications if app.job_id]
-        
-        # Get job details from applications
-        applied_jobs = Job.query.filter(Job.id.in_(job_ids)).all()
-        job_texts = [f"{job.title} {job.description}" for job in applied_jobs]
-        
-        # Combine all features
-        features = f"{skills} {' '.join(job_texts)}"
-        return features.lower()
+        return skills.lower()
+    
+    def get_user_vector(self, user):
+        """Cached profile vector for a user"""
+        return profile_vectors.get(user)
     
-    def train_vectorizer(self, jobs):
-        """Train the TF-IDF vectorizer on job data"""
+    def train_vectorizer(self, jobs=None):
+        """Refit the shared job index vocabulary on all open jobs"""
         try:
-            job_texts = [self.get_job_features(job) for job in jobs]
-            self.vectorizer.fit(job_texts)
-            self.logger.info("TF-IDF vectorizer trained successfully")
-            return True
+            return self.index.refit()
         except Exception as e:
             self.logger.error(f"Error training vectorizer: {str(e)}")
             return False
@@ -57,132 +61,252 @@ class JobMatchingService:
             return []
         
         try:
-            # Get features
-            user_features = self.get_user_features(user)
-            job_texts = [self.get_job_features(job) for job in jobs]
-            
-            # Vectorize
-            try:
-                user_vec = self.vectorizer.transform([user_features])
-                job_vecs = self.vectorizer.transform(job_texts)
-            except ValueError:
-                # If vectorizer not trained, train it first
-                if self.train_vectorizer(jobs):
-                    user_vec = self.vectorizer.transform([user_features])
-                    job_vecs = self.vectorizer.transform(job_texts)
-                else:
-                    return []
-            
-            # Calculate cosine similarity
-            similarity_scores = cosine_similarity(user_vec, job_vecs).flatten()
+            # Vectorize the profile; job rows come precomputed from the index
+            user_vec = self.get_user_vector(user)
+            
+            # Large candidate sets are scored across the process pool
+            if len(jobs) >= self.sharded.threshold:
+                matrix, rows, epoch = self.index.rows_for([job.id for job in jobs])
+                if (rows >= 0).all():
+                    return self._calculate_sharded(jobs, matrix, rows, epoch, user_vec, top_n)
+            
+            job_vecs = self.index.vectors_for(jobs)
+            
+            # Rows are L2-normalised, so the dot product is the cosine similarity
+            similarity_scores = np.asarray((job_vecs @ user_vec.T).todense()).ravel()
             
             # Normalize scores to 0-1 range
             if len(similarity_scores) > 1:
                 similarity_scores = self.scaler.fit_transform(similarity_scores.reshape(-1, 1)).flatten()
             
             # Get top N matches
-            job_scores = list(zip([job.id for job in jobs], similarity_scores))
-            job_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            return job_scores[:top_n]
+            top = self._top_k(similarity_scores, top_n)
+            return [(jobs[i].id, float(similarity_scores[i])) for i in top]
             
         except Exception as e:
             self.logger.error(f"Error calculating job matches: {str(e)}")
             return []
     
+    def _calculate_sharded(self, jobs, matrix, rows, epoch, user_vec, top_n):
+        """Sharded counterpart of the in-process scoring in calculate_similarity"""
+        positions, scores, low, high = self.sharded.top_k(matrix, epoch, rows, user_vec, top_n)
+        
+        # Same 0-1 normalisation MinMaxScaler applies over the full score range
+        if high > low:
+            scores = (scores - low) / (high - low)
+        else:
+            scores = np.zeros_like(scores)
+        
+        order = np.argsort(-scores, kind='stable')
+        return [(jobs[positions[i]].id, float(scores[i])) for i in order]
+    
     def get_job_recommendations(self, user, limit=20):
         """Get recommended jobs for a user"""
         try:
             # Get all open jobs that user hasn't applied to
-            applied_job_ids = [app.job_id for app in user.applications]
+            applied = db.session.query(
+                JobApplication.job_id, JobApplication.offer_amount
+            ).filter(JobApplication.user_id == user.id).all()
+            applied_job_ids = [job_id for job_id, _ in applied]
             
             # Get jobs that match user's preferred categories if any
             user_skills = [skill.skill.lower() for skill in user.skills]
             
-            # If user has skills, find jobs with matching tags
+            # If user has skills, find jobs with matching tags by merging posting lists
             if user_skills:
-                matching_jobs = Job.query.filter(
-                    Job.status == 'open',
-                    Job.id.notin_(applied_job_ids),
-                    Job.tags.any(JobTag.tag.in_(user_skills))
-                ).all()
+                # Plain ints: numpy ints don't bind as integers in the NOT IN below
+                candidate_ids = self.tags.jobs_matching_any(user_skills, exclude=applied_job_ids).tolist()
                 
                 # If not enough matches, include other jobs
-                if len(matching_jobs) < limit:
-                    additional_jobs = Job.query.filter(
+                if len(candidate_ids) < limit:
+                    candidate_ids += [job_id for job_id, in db.session.query(Job.id).filter(
                         Job.status == 'open',
-                        Job.id.notin_(applied_job_ids + [j.id for j in matching_jobs])
-                    ).limit(limit - len(matching_jobs)).all()
-                    matching_jobs.extend(additional_jobs)
+                        Job.id.notin_(applied_job_ids + candidate_ids)
+                    ).limit(limit - len(candidate_ids))]
             else:
                 # If no skills, just get recent open jobs
-                matching_jobs = Job.query.filter(
+                candidate_ids = [job_id for job_id, in db.session.query(Job.id).filter(
                     Job.status == 'open',
                     Job.id.notin_(applied_job_ids)
-                ).order_by(Job.created_at.desc()).limit(limit).all()
+                ).order_by(Job.created_at.desc()).limit(limit)]
             
-            # Calculate similarity scores
-            job_scores = self.calculate_similarity(user, matching_jobs, top_n=limit)
+            # Text similarity for every candidate in one sparse product
+            candidate_ids = list(dict.fromkeys(candidate_ids))
+            job_ids, text_scores, columns = self._text_scores(candidate_ids, self.get_user_vector(user))
             
-            # Get job details for top matches
-            job_ids = [job_id for job_id, _ in job_scores]
-            jobs = {job.id: job for job in matching_jobs if job.id in job_ids}
+            # Blend with distance, budget fit and skill overlap
+            offers = [offer for _, offer in applied if offer]
+            ranked = self.ranker.rank(
+                user, job_ids, text_scores, columns, limit,
+                skills=user_skills,
+                expected_budget=float(np.median(offers)) if offers else None
+            )
+            
+            # Load only the jobs being returned
+            jobs = {job.id: job for job in self._load_jobs([r['job_id'] for r in ranked])}
             
             # Return jobs in order of score
             return [{
-                'job': jobs[job_id],
-                'score': score,
-                'matching_skills': self._get_matching_skills(user, jobs[job_id])
-            } for job_id, score in job_scores if job_id in jobs]
+                'job': jobs[r['job_id']],
+                'score': r['score'],
+                'matching_skills': r['matching_skills']
+            } for r in ranked if r['job_id'] in jobs]
             
         except Exception as e:
             self.logger.error(f"Error getting job recommendations: {str(e)}")
             return []
     
-    def _get_matching_skills(self, user, job):
-        """Get list of skills that match between user and job"""
-        user_skills = {skill.skill.lower() for skill in user.skills}
-        job_tags = {tag.tag.lower() for tag in job.tags}
-        return list(user_skills.intersection(job_tags))
+    def _candidate_chunks(self, exclude, chunk_size):
+        """Yield open job ids in id order, ``chunk_size`` at a time (keyset scan)"""
+        exclude = np.asarray(sorted(exclude), dtype=np.int64)
+        last_id = 0
+        while True:
+            ids = [job_id for job_id, in db.session.query(Job.id).filter(
+                Job.status == 'open',
+                Job.id > last_id
+            ).order_by(Job.id).limit(chunk_size)]
+            if not ids:
+                return
+            last_id = ids[-1]
+            ids = np.asarray(ids, dtype=np.int64)
+            yield ids[~np.isin(ids, exclude, assume_unique=True)]
+    
+    def _text_scores(self, candidate_ids, user_vec):
+        """
+        ``(job_ids, text_scores, columns)`` for the indexed candidates; sets of
+        at least the sharding threshold are scored across the process pool.
+        """
+        job_ids, rows, columns, matrix, epoch = self.index.locate(candidate_ids)
+        if len(rows) >= self.sharded.threshold:
+            return job_ids, self.sharded.scores(matrix, epoch, rows, user_vec), columns
+        return job_ids, np.asarray((matrix[rows] @ user_vec.T).todense()).ravel(), columns
+    
+    def _scored_chunks(self, user, chunks, skills, expected_budget):
+        """Yield ``(job_ids, scores)`` per candidate chunk"""
+        user_vec = self.get_user_vector(user)
+        for candidate_ids in chunks:
+            job_ids, text_scores, columns = self._text_scores(candidate_ids, user_vec)
+            if not len(job_ids):
+                continue
+            scores, _ = self.ranker.score(
+                user, job_ids, text_scores, columns, skills, expected_budget, absolute=True
+            )
+            yield job_ids, scores
+    
+    def _ranked_scores(self, user, chunk_size):
+        """
+        ``(job_ids, scores, user_skills)`` for every open job not applied to,
+        ordered by (score desc, job id asc). Computed by a chunked scan and
+        cached per user until the index epoch, the job set (the search cache
+        version, bumped on every job create/status change) or the user's
+        profile changes, so later pages only slice it.
+        """
+        from app.services.search_cache import search_cache
+        
+        user_skills = [skill.skill.lower() for skill in user.skills]
+        stamp = (self.index.epoch, search_cache.version, user.profile_updated_at, tuple(sorted(user_skills)))
+        with self._page_lock:
+            cached = self._page_cache.get(user.id)
+            if cached is not None and cached[0] == stamp:
+                self._page_cache.move_to_end(user.id)
+                return cached[1], cached[2], user_skills
+        
+        applied = db.session.query(
+            JobApplication.job_id, JobApplication.offer_amount
+        ).filter(JobApplication.user_id == user.id).all()
+        offers = [offer for _, offer in applied if offer]
+        expected_budget = float(np.median(offers)) if offers else None
+        
+        chunks = list(self._candidate_chunks({job_id for job_id, _ in applied}, chunk_size))
+        # In-process scoring stays chunked to bound the row copies; the pool
+        # reads rows from shared memory, so a large set goes in one call
+        if sum(len(ids) for ids in chunks) >= self.sharded.threshold:
+            chunks = [np.concatenate(chunks)]
+        parts = list(self._scored_chunks(user, chunks, user_skills, expected_budget))
+        job_ids = np.concatenate([ids for ids, _ in parts]) if parts else np.empty(0, dtype=np.int64)
+        scores = np.concatenate([sc for _, sc in parts]).astype(np.float64) if parts else np.empty(0)
+        order = np.lexsort((job_ids, -scores))
+        job_ids, scores = job_ids[order], scores[order]
+        
+        with self._page_lock:
+            self._page_cache[user.id] = (stamp, job_ids, scores)
+            self._page_cache.move_to_end(user.id)
+            while len(self._page_cache) > self.page_cache_size:
+                self._page_cache.popitem(last=False)
+        return job_ids, scores, user_skills
+    
+    def recommendation_page(self, user, limit=20, after=None, chunk_size=2000):
+        """
+        One page of recommendations ordered by (score desc, job id asc).
+        
+        The first page scores every candidate in vectorised chunks; the
+        ranked vector is cached (see :meth:`_ranked_scores`), so deeper pages
+        binary-search the ``after`` position (a ``(score, job_id)`` pair from
+        the previous page) and slice. Scores are absolute, so pages are
+        consistent with each other. Returns ``(results, next_after)``;
+        ``next_after`` is ``None`` on the last page.
+        """
+        all_ids, all_scores, user_skills = self._ranked_scores(user, chunk_size)
+        
+        start = 0
+        if after is not None:
+            after_score, after_id = after
+            neg = -all_scores
+            lo = int(np.searchsorted(neg, -after_score, side='left'))
+            hi = int(np.searchsorted(neg, -after_score, side='right'))
+            start = lo + int(np.searchsorted(all_ids[lo:hi], after_id, side='right'))
+        
+        job_ids = all_ids[start:start + limit]
+        scores = all_scores[start:start + limit]
+        has_more = start + limit < len(all_ids)
+        
+        masks = self.ranker.skill_masks(user_skills, job_ids)
+        jobs = {job.id: job for job in self._load_jobs(job_ids)}
+        results = [{
+            'job': jobs[int(job_id)],
+            'score': float(score),
+            'matching_skills': [skill for skill, mask in masks.items() if mask[i]]
+        } for i, (score, job_id) in enumerate(zip(scores, job_ids)) if int(job_id) in jobs]
+        
+        next_after = (float(scores[-1]), int(job_ids[-1])) if has_more and len(job_ids) else None
+        return results, next_after
+    
+    @staticmethod
+    def _load_jobs(job_ids, chunk_size=500):
+        """Load jobs by id in bounded IN () chunks"""
+        job_ids = [int(job_id) for job_id in job_ids]
+        jobs = []
+        for start in range(0, len(job_ids), chunk_size):
+            jobs.extend(Job.query.filter(Job.id.in_(job_ids[start:start + chunk_size])).all())
+        return jobs
+    
+    @staticmethod
+    def _top_k(scores, k):
+        """Indices of the ``k`` highest scores, best first"""
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        return top[np.argsort(-scores[top], kind='stable')]
     
     def get_similar_jobs(self, job_id, limit=5):
         """Get jobs similar to a given job"""
         try:
             target_job = Job.query.get_or_404(job_id)
-            other_jobs = Job.query.filter(
-                Job.id != job_id,
-                Job.status == 'open'
-            ).limit(100).all()  # Limit for performance
             
-            if not other_jobs:
+            # Approximate neighbours over all open jobs, re-ranked exactly
+            target_vec = self.index.vectors_for([target_job])
+            job_ids, similarity_scores = self.index.nearest(target_vec, limit, exclude=job_id)
+            
+            if not len(job_ids):
                 return []
-                
-            # Calculate similarity
-            target_features = self.get_job_features(target_job)
-            job_texts = [self.get_job_features(job) for job in other_jobs]
-            
-            # Vectorize
-            try:
-                target_vec = self.vectorizer.transform([target_features])
-                job_vecs = self.vectorizer.transform(job_texts)
-            except ValueError:
-                # If vectorizer not trained, train it first
-                if self.train_vectorizer([target_job] + other_jobs):
-                    target_vec = self.vectorizer.transform([target_features])
-                    job_vecs = self.vectorizer.transform(job_texts)
-                else:
-                    return []
-            
-            # Calculate similarity
-            similarity_scores = cosine_similarity(target_vec, job_vecs).flatten()
             
             # Get top matches
-            job_scores = list(zip([job.id for job in other_jobs], similarity_scores))
-            job_scores.sort(key=lambda x: x[1], reverse=True)
+            top = self._top_k(similarity_scores, limit)
+            job_scores = [(int(job_ids[i]), float(similarity_scores[i])) for i in top]
             
             # Get job details for top matches
-            job_ids = [job_id for job_id, _ in job_scores[:limit]]
-            jobs = {job.id: job for job in other_jobs if job.id in job_ids}
+            jobs = {job.id: job for job in Job.query.filter(Job.id.in_([j for j, _ in job_scores])).all()}
             
             return [{
                 'job': jobs[job_id],
@@ -0,0 +1,130 @@
+import gc
+import logging
+import threading
+from collections import OrderedDict
+
+from app.services.single_flight import SingleFlight
+
+
+def model_nbytes(entry):
+    """Resident bytes of a loaded model's parameters and buffers (0 if unknown)"""
+    model = entry.get('model') if isinstance(entry, dict) else entry
+    total = 0
+    for tensors in (getattr(model, 'parameters', None), getattr(model, 'buffers', None)):
+        if tensors is None:
+            continue
+        for tensor in tensors():
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded models, keyed by model name.
+
+    Every language pair served by the same checkpoint shares one loaded
+    instance. Each model's resident size is measured when it is loaded and
+    remembered by name, so reloading an evicted model first drops least
+    recently used models until it fits within ``max_bytes``; only a model
+    that has never been loaded is sized after the fact and evicts others
+    once it is in memory. The model being loaded is never dropped, so one
+    larger than the budget still works. Loads are single-flight: concurrent
+    first requests for a model wait for one load instead of starting their
+    own.
+    Callers already holding an evicted model keep it alive until they finish.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 ** 3, sizer=model_nbytes):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.flights = SingleFlight()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self._models = OrderedDict()  # name -> (entry, bytes)
+        self._sizes = {}  # name -> bytes measured at its last load
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        budget_mb = app.config.get('TRANSLATION_MODEL_MEMORY_MB')
+        if budget_mb:
+            self.max_bytes = int(budget_mb) * 1024 ** 2
+
+    def get(self, name, loader):
+        """Loaded model ``name``, calling ``loader(name)`` on first use"""
+        with self._lock:
+            cached = self._models.get(name)
+            if cached is not None:
+                self._models.move_to_end(name)
+                self.hits += 1
+                return cached[0]
+        return self.flights.do(name, lambda: self._load(name, loader))
+
+    def _evict_until(self, budget, keep=None):
+        """Drop LRU models until ``budget`` bytes fit (caller holds the lock)"""
+        evicted = []
+        for old_name in list(self._models):
+            if self._bytes <= budget:
+                break
+            if old_name == keep:
+                continue
+            _, old_size = self._models.pop(old_name)
+            self._bytes -= old_size
+            self.evictions += 1
+            evicted.append(old_name)
+        return evicted
+
+    def _collect(self, evicted):
+        if evicted:
+            self.logger.info(f"Evicted models {', '.join(evicted)} to stay within {self.max_bytes / 1024 ** 2:.0f} MB")
+            gc.collect()
+
+    def _load(self, name, loader):
+        with self._lock:
+            cached = self._models.get(name)
+            if cached is not None:
+                return cached[0]
+            known = self._sizes.get(name)
+            # Make room first when the size is known, so peak memory stays in budget
+            evicted = self._evict_until(self.max_bytes - known) if known is not None else []
+        self._collect(evicted)
+
+        entry = loader(name)
+        size = self.sizer(entry)
+        with self._lock:
+            self._models[name] = (entry, size)
+            self._sizes[name] = size
+            self._bytes += size
+            self.loads += 1
+            evicted = self._evict_until(self.max_bytes, keep=name)
+        self.logger.info(f"Loaded model {name} ({size / 1024 ** 2:.0f} MB)")
+        self._collect(evicted)
+        return entry
+
+    def evict(self, name):
+        with self._lock:
+            cached = self._models.pop(name, None)
+            if cached is None:
+                return False
+            self._bytes -= cached[1]
+            self.evictions += 1
+        gc.collect()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'models': {name: size for name, (_, size) in self._models.items()},
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'loads': self.loads,
+                'evictions': self.evictions,
+                'loading': self.flights.in_flight(),
+            }
+
+
+# Global instance
+model_registry = ModelRegistry()
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from flask import current_app, jsonify, render_template, request, url_for
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import DateTime, tuple_
+
+
+def _serializer(salt):
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=salt)
+
+
+def encode_cursor(values, salt):
+    """Opaque, signed token for a keyset position (a list of JSON values)"""
+    return _serializer(salt).dumps(list(values))
+
+
+def decode_cursor(token, salt):
+    """
+    Inverse of :func:`encode_cursor`. Returns ``None`` for an empty token and
+    raises ``ValueError`` for a tampered or foreign one.
+    """
+    if not token:
+        return None
+    try:
+        return _serializer(salt).loads(token)
+    except BadSignature:
+        raise ValueError('Invalid cursor')
+
+
+def _to_json(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _from_json(column, value):
+    if isinstance(column.type, DateTime) and value is not None:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def keyset_page(query, columns, cursor, limit, salt, descending=True):
+    """
+    Seek pagination: order ``query`` by ``columns`` (which must end in a
+    unique column) and return ``(items, next_cursor)`` for the page after
+    ``cursor``. One extra row is fetched to tell whether another page exists,
+    so no COUNT(*) is needed; ``next_cursor`` is ``None`` on the last page.
+
+    ``columns`` may come from joined tables (e.g. a search rank); only the
+    query's own entities are returned.
+    """
+    after = decode_cursor(cursor, salt)
+    if after is not None:
+        if len(after) != len(columns):
+            raise ValueError('Invalid cursor')
+        key = tuple_(*columns)
+        bound = tuple_(*[_from_json(column, value) for column, value in zip(columns, after)])
+        query = query.filter(key < bound if descending else key > bound)
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.add_columns(*columns).order_by(None).order_by(*order).limit(limit + 1).all()
+
+    items = [row[0] for row in rows[:limit]]
+    if len(rows) <= limit:
+        return items, None
+    values = rows[limit - 1][1:]
+    return items, encode_cursor([_to_json(value) for value in values], salt)
+
+
+def next_page_url(next_cursor):
+    """URL of the current view with ``cursor`` replaced, or ``None``"""
+    if not next_cursor:
+        return None
+    args = request.args.to_dict()
+    args['cursor'] = next_cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+
+def page_limit(default=None, maximum=100):
+    """Page size from ``?limit=``, clamped to ``1..maximum``"""
+    default = default or current_app.config.get('JOBS_PAGE_SIZE', 20)
+    return min(max(request.args.get('limit', default, type=int), 1), maximum)
+
+
+def job_page_response(template, jobs, next_cursor, **context):
+    """Render a page of jobs, or return it as JSON for ``?format=json``"""
+    if request.args.get('format') == 'json':
+        return jsonify({
+            'jobs': [job.to_dict() for job in jobs],
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        })
+    return render_template(template, jobs=jobs, next_url=next_page_url(next_cursor), **context)
@@ -0,0 +1,156 @@
+import io
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy.exc import IntegrityError
+
+from app.services.job_index import job_index
+
+
+def _dump(vec):
+    buf = io.BytesIO()
+    np.savez(buf, indices=vec.indices.astype(np.int32), data=vec.data.astype(np.float32))
+    return buf.getvalue()
+
+
+def _load(blob, n_features):
+    arrays = np.load(io.BytesIO(blob))
+    indices, data = arrays['indices'], arrays['data']
+    return sp.csr_matrix((data, indices, [0, len(indices)]), shape=(1, n_features))
+
+
+class ProfileVectorCache:
+    """
+    Per-user profile vectors for matching.
+
+    A profile is the user's weighted skills plus the index rows of their most
+    recent applications, each decayed by recency, L2-normalised. Entries are
+    keyed on the job index vocabulary fingerprint and the user's
+    ``profile_updated_at``, so a refit or a profile change elsewhere makes
+    them stale; routes that change skills or applications also evict
+    explicitly. Vectors live in a bounded in-memory LRU and, when
+    ``PROFILE_VECTOR_PERSIST`` is on, in ``user_profile_vectors``.
+    """
+
+    def __init__(self, max_entries=10000, history_window=20, decay=0.85, persist=False):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.history_window = history_window
+        self.decay = decay
+        self.persist = persist
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('PROFILE_VECTOR_CACHE_SIZE', self.max_entries)
+        self.history_window = app.config.get('PROFILE_HISTORY_WINDOW', self.history_window)
+        self.decay = app.config.get('PROFILE_HISTORY_DECAY', self.decay)
+        self.persist = app.config.get('PROFILE_VECTOR_PERSIST', self.persist)
+
+    def _stamp(self, user):
+        return (job_index.fingerprint, user.profile_updated_at)
+
+    def get(self, user, remember=True):
+        """Return the 1 x vocabulary CSR profile vector for ``user``"""
+        job_index.ensure_built()
+        stamp = self._stamp(user)
+        with self._lock:
+            entry = self._lru.get(user.id)
+            if entry is not None and entry[0] == stamp:
+                self._lru.move_to_end(user.id)
+                return entry[1]
+
+        vec = self._load_persisted(user, stamp) if self.persist else None
+        if vec is None:
+            vec = self.build(user)
+            if self.persist:
+                self._store_persisted(user, stamp, vec)
+
+        if remember:
+            with self._lock:
+                self._lru[user.id] = (stamp, vec)
+                self._lru.move_to_end(user.id)
+                while len(self._lru) > self.max_entries:
+                    self._lru.popitem(last=False)
+        return vec
+
+    def build(self, user):
+        """Compute a profile vector from skills and a decayed application window"""
+        from app import db
+        from app.models import Job, JobApplication
+
+        skills = ' '.join([f"{skill.skill} " * (skill.experience_years or 1)
+                           for skill in user.skills])
+        vec = job_index.transform([skills.lower()])
+
+        # One bounded query for the most recent applied jobs
+        recent = db.session.query(Job).join(
+            JobApplication, JobApplication.job_id == Job.id
+        ).filter(
+            JobApplication.user_id == user.id
+        ).order_by(
+            JobApplication.created_at.desc(), JobApplication.id.desc()
+        ).limit(self.history_window).all()
+
+        if recent:
+            weights = self.decay ** np.arange(len(recent))
+            history = job_index.vectors_for(recent)
+            vec = vec + sp.csr_matrix(weights) @ history
+
+        vec = sp.csr_matrix(vec)
+        norm = np.sqrt(vec.multiply(vec).sum())
+        if norm > 0:
+            vec = vec / norm
+        return sp.csr_matrix(vec)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._lru.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+    def _load_persisted(self, user, stamp):
+        from app.models import UserProfileVector
+
+        try:
+            row = UserProfileVector.query.get(user.id)
+            if row is None or row.vocabulary != stamp[0] or row.profile_updated_at != stamp[1]:
+                return None
+            return _load(row.vector, job_index.vocabulary_size)
+        except Exception as e:
+            self.logger.error(f"Error loading profile vector for user {user.id}: {str(e)}")
+            return None
+
+    def _store_persisted(self, user, stamp, vec):
+        from app import db
+        from app.models import UserProfileVector
+
+        table = UserProfileVector.__table__
+        values = {
+            'vocabulary': stamp[0],
+            'profile_updated_at': stamp[1],
+            'vector': _dump(vec),
+            'updated_at': datetime.utcnow(),
+        }
+        # Own transaction, so the caller's session is never committed here
+        try:
+            with db.engine.begin() as conn:
+                updated = conn.execute(
+                    table.update().where(table.c.user_id == user.id).values(**values)
+                ).rowcount
+                if not updated:
+                    conn.execute(table.insert().values(user_id=user.id, **values))
+        except IntegrityError:
+            pass  # Another request stored this user's vector first
+        except Exception as e:
+            self.logger.error(f"Error storing profile vector for user {user.id}: {str(e)}")
+
+
+# Global instance
+profile_vectors = ProfileVectorCache()
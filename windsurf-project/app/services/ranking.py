@@ -0,0 +1,121 @@
+import logging
+
+import numpy as np
+
+from app.services.geo import haversine_km
+from app.services.tag_index import tag_index
+
+DEFAULT_WEIGHTS = {
+    'text': 0.6,
+    'distance': 0.2,
+    'budget': 0.1,
+    'skills': 0.1,
+}
+
+
+class HybridRanker:
+    """
+    Final ranking stage for job recommendations.
+
+    Combines, in one vectorised pass over the candidate arrays:
+
+    - ``text``: TF-IDF similarity, min-max normalised over the candidates
+    - ``distance``: ``exp(-km / distance_scale_km)`` from the user's location
+    - ``budget``: closeness of the job budget to what the user usually offers
+      (log ratio), or the budget's rank among candidates if there is no history
+    - ``skills``: share of the user's skills found in the job's tags
+
+    Components that cannot be computed (no user location, no budget) are a
+    constant 0.5 and so do not change the order.
+    """
+
+    def __init__(self, weights=None, distance_scale_km=25.0):
+        self.logger = logging.getLogger(__name__)
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.distance_scale_km = distance_scale_km
+        self.tags = tag_index
+
+    def init_app(self, app):
+        self.weights = dict(app.config.get('RANKING_WEIGHTS', self.weights))
+        self.distance_scale_km = app.config.get('RANKING_DISTANCE_SCALE_KM', self.distance_scale_km)
+
+    @staticmethod
+    def _minmax(values):
+        low, high = np.nanmin(values), np.nanmax(values)
+        if not np.isfinite(low) or high <= low:
+            return np.full(len(values), 0.5)
+        return (values - low) / (high - low)
+
+    def distance_score(self, user, columns):
+        lat, lng = getattr(user, 'latitude', None), getattr(user, 'longitude', None)
+        if lat is None or lng is None:
+            return np.full(len(columns['latitude']), 0.5)
+        km = haversine_km(lat, lng, columns['latitude'], columns['longitude'])
+        return np.where(np.isnan(km), 0.5, np.exp(-km / self.distance_scale_km))
+
+    def budget_score(self, columns, expected_budget=None):
+        budget = columns['budget']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if expected_budget:
+                fit = np.exp(-np.abs(np.log(budget / expected_budget)))
+            else:
+                fit = self._minmax(np.log1p(budget))
+        return np.where(np.isnan(fit), 0.5, fit)
+
+    def skill_masks(self, skills, job_ids):
+        """``{skill: bool array}`` marking candidates tagged with each skill"""
+        return {skill: np.isin(job_ids, self.tags.postings(skill), assume_unique=True) for skill in skills}
+
+    def score(self, user, job_ids, text_scores, columns, skills=(), expected_budget=None, absolute=False):
+        """
+        Blended score per candidate and the ``{skill: mask}`` it used.
+
+        With ``absolute`` the text similarity is used as is and a missing
+        budget history scores neutrally, so a job's score does not depend on
+        which other jobs are in the batch (needed to page through chunks).
+        """
+        masks = self.skill_masks(skills, job_ids)
+        if masks:
+            overlap = np.sum(list(masks.values()), axis=0) / len(masks)
+        else:
+            overlap = np.zeros(len(job_ids))
+
+        if absolute:
+            text = np.asarray(text_scores, dtype=np.float64)
+            budget = self.budget_score(columns, expected_budget) if expected_budget else np.full(len(job_ids), 0.5)
+        else:
+            text = self._minmax(text_scores)
+            budget = self.budget_score(columns, expected_budget)
+
+        w = self.weights
+        scores = (w.get('text', 0) * text
+                  + w.get('distance', 0) * self.distance_score(user, columns)
+                  + w.get('budget', 0) * budget
+                  + w.get('skills', 0) * overlap)
+        return scores, masks
+
+    def rank(self, user, job_ids, text_scores, columns, limit, skills=(), expected_budget=None):
+        """
+        Score candidates and return the best ``limit`` as a list of
+        ``{'job_id', 'score', 'matching_skills'}`` dicts, best first.
+        """
+        if not len(job_ids):
+            return []
+
+        scores, masks = self.score(user, job_ids, text_scores, columns, skills, expected_budget)
+
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [{
+            'job_id': int(job_ids[i]),
+            'score': float(scores[i]),
+            'matching_skills': [skill for skill, mask in masks.items() if mask[i]],
+        } for i in top]
+
+
+# Global instance
+hybrid_ranker = HybridRanker()
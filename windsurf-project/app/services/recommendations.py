@@ -0,0 +1,192 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import scipy.sparse as sp
+from sqlalchemy import insert
+
+logger = logging.getLogger(__name__)
+
+# Job matrix (transposed) shared with pool workers through the initializer
+_JOB_MATRIX_T = None
+
+
+def _init_worker(job_matrix_t):
+    global _JOB_MATRIX_T
+    _JOB_MATRIX_T = job_matrix_t
+
+
+def _top_n_chunk(user_matrix, applied_cols, top_n):
+    """
+    Score one chunk of workers against every job.
+
+    ``applied_cols`` holds, per worker, the job columns to exclude. Only the
+    non-zero entries of each sparse score row are ranked, so the chunk is
+    never densified.
+    Returns a list of ``(cols, scores)`` arrays, best first.
+    """
+    scores = (user_matrix @ _JOB_MATRIX_T).tocsr()
+    results = []
+    for i in range(scores.shape[0]):
+        start, end = scores.indptr[i], scores.indptr[i + 1]
+        cols, data = scores.indices[start:end], scores.data[start:end]
+        if len(applied_cols[i]):
+            keep = ~np.isin(cols, applied_cols[i])
+            cols, data = cols[keep], data[keep]
+        if top_n < len(data):
+            top = np.argpartition(-data, top_n - 1)[:top_n]
+        else:
+            top = np.arange(len(data))
+        top = top[np.argsort(-data[top], kind='stable')]
+        results.append((cols[top], data[top]))
+    return results
+
+
+class RecommendationBatch:
+    """
+    Offline worker -> job recommendation stage.
+
+    Builds profile vectors for workers in chunks, multiplies each chunk
+    against the job index matrix (spread over a process pool) and replaces
+    the workers' rows in ``job_recommendations``. Incremental runs only
+    revisit workers whose profile changed since the last finished generation
+    or who have never been scored.
+    """
+
+    def __init__(self, top_n=50, chunk_size=256, workers=None):
+        self.top_n = top_n
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+
+    def _pending_workers(self, full):
+        from app import db
+        from app.models import User, RecommendationGeneration, JobRecommendation
+
+        query = User.query.filter(User.user_type == 'worker')
+        if full:
+            return query.order_by(User.id)
+
+        last = RecommendationGeneration.query.filter(
+            RecommendationGeneration.finished_at.isnot(None)
+        ).order_by(RecommendationGeneration.id.desc()).first()
+        never_scored = ~db.session.query(JobRecommendation.id).filter(
+            JobRecommendation.user_id == User.id
+        ).exists()
+        if last is None:
+            return query.order_by(User.id)
+        return query.filter(
+            db.or_(User.profile_updated_at > last.started_at, never_scored)
+        ).order_by(User.id)
+
+    def _chunks(self, query):
+        """Yield lists of workers in id order without loading them all at once"""
+        from app.models import User
+
+        last_id = 0
+        while True:
+            chunk = query.filter(User.id > last_id).limit(self.chunk_size).all()
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1].id
+
+    def run(self, full=False):
+        """Run one generation; returns the finished ``RecommendationGeneration``"""
+        from app import db
+        from app.models import JobApplication, RecommendationGeneration
+        from app.services.job_index import job_index
+        from app.services.profile_vectors import profile_vectors
+
+        matrix, job_ids, alive = job_index.snapshot()
+        matrix, job_ids = matrix[alive], job_ids[alive]
+        col_of = {int(job_id): col for col, job_id in enumerate(job_ids)}
+
+        generation = RecommendationGeneration(full=full, job_count=len(job_ids))
+        db.session.add(generation)
+        db.session.commit()
+
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(matrix.T.tocsr(),)
+            )
+        else:
+            _init_worker(matrix.T.tocsr())
+
+        scored = 0
+        try:
+            batches = []
+            for chunk in self._chunks(self._pending_workers(full)):
+                user_ids = [user.id for user in chunk]
+                user_matrix = sp.vstack(
+                    [profile_vectors.get(user, remember=False) for user in chunk], format='csr'
+                )
+
+                applied = {user_id: [] for user_id in user_ids}
+                for user_id, job_id in db.session.query(
+                    JobApplication.user_id, JobApplication.job_id
+                ).filter(JobApplication.user_id.in_(user_ids)):
+                    if job_id in col_of:
+                        applied[user_id].append(col_of[job_id])
+                applied_cols = [np.array(applied[user_id], dtype=np.int64) for user_id in user_ids]
+
+                args = (user_matrix, applied_cols, self.top_n)
+                if pool:
+                    batches.append((user_ids, pool.submit(_top_n_chunk, *args)))
+                else:
+                    self._write(generation, user_ids, _top_n_chunk(*args), job_ids)
+                    scored += len(user_ids)
+
+                # Keep a bounded number of chunks in flight
+                while len(batches) >= self.workers * 2:
+                    done_ids, future = batches.pop(0)
+                    self._write(generation, done_ids, future.result(), job_ids)
+                    scored += len(done_ids)
+
+            for done_ids, future in batches:
+                self._write(generation, done_ids, future.result(), job_ids)
+                scored += len(done_ids)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        generation.worker_count = scored
+        generation.finished_at = datetime.utcnow()
+        db.session.commit()
+        logger.info(f"Recommendation generation {generation.id}: {scored} workers x {len(job_ids)} jobs")
+        return generation
+
+    def _write(self, generation, user_ids, results, job_ids):
+        from app import db
+        from app.models import JobRecommendation
+
+        rows = []
+        for user_id, (cols, scores) in zip(user_ids, results):
+            for rank, (col, score) in enumerate(zip(cols, scores), start=1):
+                rows.append({
+                    'user_id': user_id,
+                    'job_id': int(job_ids[col]),
+                    'generation_id': generation.id,
+                    'rank': rank,
+                    'score': float(score),
+                })
+        JobRecommendation.query.filter(
+            JobRecommendation.user_id.in_(user_ids)
+        ).delete(synchronize_session=False)
+        if rows:
+            db.session.execute(insert(JobRecommendation), rows)
+        db.session.commit()
+
+
+def run_recommendation_batch(full=False, top_n=None, chunk_size=None, workers=None):
+    """Entry point for the CLI and external schedulers"""
+    from flask import current_app
+
+    batch = RecommendationBatch(
+        top_n=top_n or current_app.config.get('RECOMMENDATIONS_TOP_N', 50),
+        chunk_size=chunk_size or current_app.config.get('RECOMMENDATIONS_CHUNK_SIZE', 256),
+        workers=workers,
+    )
+    return batch.run(full=full)
@@ -0,0 +1,72 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from app.services.single_flight import SingleFlight
+from app.services.text_features import normalize_text
+
+
+class SearchCache:
+    """
+    Result cache in front of job search.
+
+    Entries map a normalised ``(query, location, cursor, limit)`` key to the
+    page's job ids and next cursor, and expire after ``ttl`` seconds or when
+    pushed out of the LRU. Keys start with a version counter that routes
+    bump whenever a job is created or changes status, so every cached page
+    goes stale at once without scanning; only keys of the current version
+    are stored. Concurrent misses for one key share a single query
+    (:class:`SingleFlight`). The cache is per process.
+    """
+
+    def __init__(self, max_entries=2048, ttl=60):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.flights = SingleFlight()
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('SEARCH_CACHE_SIZE', self.max_entries)
+        self.ttl = app.config.get('SEARCH_CACHE_TTL', self.ttl)
+
+    def key(self, query, location, cursor, limit):
+        return (self.version, normalize_text(query), normalize_text(location), cursor or '', limit)
+
+    def bump(self):
+        """Invalidate every cached page (jobs were created or changed status)"""
+        with self._lock:
+            self.version += 1
+            self._lru.clear()
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, computing it at most once across threads"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and entry[0] > now:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self.flights.do(key, lambda: self._compute(key, compute))
+
+    def _compute(self, key, compute):
+        result = compute()
+        with self._lock:
+            # A bump while computing means the result may already be stale
+            if key[0] == self.version:
+                self._lru[key] = (time.monotonic() + self.ttl, result)
+                self._lru.move_to_end(key)
+                while len(self._lru) > self.max_entries:
+                    self._lru.popitem(last=False)
+        return result
+
+
+# Global instance
+search_cache = SearchCache()
@@ -0,0 +1,150 @@
+import logging
+import re
+
+from sqlalchemy import Float, Integer, inspect, text
+
+from app import db
+
+_TOKEN_RE = re.compile(r'[\w\u0900-\u0D7F]+')
+
+# Keep in sync with the add_jobs_search_index migration
+SQLITE_SCHEMA = [
+    # unicode61 treats combining marks as separators by default, which would
+    # split Indic words at every vowel sign
+    """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, description, location,
+        content='jobs', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, description, location ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO jobs_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+]
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({0}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({0}description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce({0}location, '')), 'C')"
+)
+
+POSTGRES_SCHEMA = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)",
+    f"""CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {POSTGRES_VECTOR.format('NEW.')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs",
+    """CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, location ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()""",
+]
+
+
+def search_tokens(value):
+    return _TOKEN_RE.findall((value or '').casefold())
+
+
+class SearchIndex:
+    """
+    Full-text index over job title, description and location.
+
+    SQLite uses an external-content FTS5 table ranked by BM25; PostgreSQL a
+    weighted ``tsvector`` column with a GIN index ranked by ``ts_rank_cd``.
+    Both are maintained by database triggers (created by migration or by
+    ``flask search rebuild``). Every query token is a prefix match and all
+    tokens must match. When the index is missing, callers fall back to
+    ``ilike`` filters.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._available = None
+
+    @property
+    def dialect(self):
+        return db.engine.dialect.name
+
+    def available(self):
+        if self._available is None:
+            if self.dialect == 'sqlite':
+                self._available = inspect(db.engine).has_table('jobs_fts')
+            elif self.dialect == 'postgresql':
+                columns = inspect(db.engine).get_columns('jobs')
+                self._available = any(column['name'] == 'search_vector' for column in columns)
+            else:
+                self._available = False
+            if not self._available:
+                self.logger.warning("Full-text job index missing; run 'flask search rebuild'")
+        return self._available
+
+    def rebuild(self):
+        """Create the index structures if needed and backfill every job"""
+        if self.dialect == 'sqlite':
+            statements = SQLITE_SCHEMA + ["INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"]
+        elif self.dialect == 'postgresql':
+            statements = POSTGRES_SCHEMA + [f"UPDATE jobs SET search_vector = {POSTGRES_VECTOR.format('')}"]
+        else:
+            raise RuntimeError(f"Full-text search is not supported on {self.dialect}")
+
+        with db.engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+            count = conn.execute(text("SELECT COUNT(*) FROM jobs")).scalar()
+        self._available = True
+        return count
+
+    def _ranked(self, query, location):
+        """Subquery of ``(job_id, rank)`` rows, lower rank is better"""
+        words, places = search_tokens(query), search_tokens(location)
+        if self.dialect == 'sqlite':
+            match = [f'"{word}"*' for word in words] + [f'location : "{place}"*' for place in places]
+            sql = text(
+                "SELECT rowid AS job_id, bm25(jobs_fts, 10.0, 2.0, 1.0) AS rank "
+                "FROM jobs_fts WHERE jobs_fts MATCH :match"
+            ).bindparams(match=' '.join(match))
+        else:
+            terms = [f"{word}:*AB" for word in words] + [f"{place}:*C" for place in places]
+            sql = text(
+                "SELECT id AS job_id, -ts_rank_cd(search_vector, query, 1) AS rank "
+                "FROM jobs, to_tsquery('simple', :terms) AS query "
+                "WHERE search_vector @@ query"
+            ).bindparams(terms=' & '.join(terms))
+        return sql.columns(job_id=Integer, rank=Float).subquery('search_ranked')
+
+    def filter(self, jobs, query, location=''):
+        """
+        Restrict a ``Job`` query to full-text matches. Returns the joined
+        query and its rank column (ascending is best first), or ``None`` when
+        there is nothing to search with the index.
+        """
+        from app.models import Job
+
+        if not (search_tokens(query) or search_tokens(location)) or not self.available():
+            return None
+        ranked = self._ranked(query, location)
+        return jobs.join(ranked, ranked.c.job_id == Job.id), ranked.c.rank
+
+    def matching_ids(self, query, location=''):
+        """Ids of every job matching the text, or ``None`` as for :meth:`filter`"""
+        if not (search_tokens(query) or search_tokens(location)) or not self.available():
+            return None
+        ranked = self._ranked(query, location)
+        return [job_id for job_id, in db.session.query(ranked.c.job_id)]
+
+
+# Global instance
+search_index = SearchIndex()
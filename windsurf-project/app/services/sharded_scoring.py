@@ -0,0 +1,235 @@
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import scipy.sparse as sp
+
+# Per-process cache of attached shared matrices: key -> (blocks, csr matrix)
+_ATTACHED = {}
+
+
+def _attach(meta):
+    """Map the published CSR matrix into this worker without copying it"""
+    key = meta['key']
+    cached = _ATTACHED.get(key)
+    if cached is not None:
+        blocks, matrix = cached
+        if matrix.shape == tuple(meta['shape']):
+            return matrix
+    else:
+        # Drop the old views before closing, or the blocks stay exported
+        stale = [old_blocks for old_blocks, _ in _ATTACHED.values()]
+        _ATTACHED.clear()
+        for old_blocks in stale:
+            for block in old_blocks:
+                block.close()
+        blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in meta['arrays']]
+
+    # Rows appended in place since the last call only lengthen the views
+    arrays = [
+        np.ndarray((length,), dtype=dtype, buffer=block.buf)
+        for block, (_, dtype, length) in zip(blocks, meta['arrays'])
+    ]
+    matrix = sp.csr_matrix(tuple(arrays), shape=meta['shape'], copy=False)
+    _ATTACHED[key] = (blocks, matrix)
+    return matrix
+
+
+def _score_rows(meta, rows, vec_indices, vec_data):
+    """Scores of ``rows`` of the shared matrix against one sparse vector"""
+    matrix = _attach(meta)
+    vec = sp.csr_matrix(
+        (vec_data, vec_indices, [0, len(vec_indices)]), shape=(1, meta['shape'][1])
+    )
+    return np.asarray((matrix[rows] @ vec.T).todense()).ravel()
+
+
+def _score_shard(meta, rows, vec_indices, vec_data, k):
+    """
+    Score ``rows`` of the shared matrix against one sparse vector.
+
+    Returns ``(positions, scores, min, max)`` where ``positions`` index into
+    ``rows`` and only the shard's top ``k`` are included.
+    """
+    scores = _score_rows(meta, rows, vec_indices, vec_data)
+    if not len(scores):
+        return np.empty(0, dtype=np.int64), scores, None, None
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top, scores[top], float(scores.min()), float(scores.max())
+
+
+class ShardedScorer:
+    """
+    Scores large candidate sets against the job index across a process pool.
+
+    The index matrix is published into shared memory with ``growth`` times
+    the space it needs; rows the index appends within an epoch are written
+    into that spare space, so only a refit or running out of capacity copies
+    the whole matrix again. Each worker attaches to the blocks and scores one
+    contiguous shard of the candidate rows, returning either a partial top-k
+    plus its score range, which the parent merges (:meth:`top_k`), or every
+    score, which the parent concatenates (:meth:`scores`). Callers should
+    stay in-process below ``threshold``.
+    """
+
+    def __init__(self, threshold=20000, workers=None, growth=1.5):
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.growth = growth
+        self._pool = None
+        self._published = None
+        self._views = []
+        self._blocks = []
+        self._retired = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def init_app(self, app):
+        self.threshold = app.config.get('SHARDED_SCORING_THRESHOLD', self.threshold)
+        self.workers = app.config.get('SHARDED_SCORING_WORKERS') or self.workers
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _publish(self, matrix, epoch, max_row):
+        """
+        Make ``matrix`` visible to the workers for ``max_row`` and return its
+        metadata. Rows are append-only within an epoch, so newer rows go into
+        the spare capacity of the current blocks when they fit.
+        """
+        published = self._published
+        if published and published['epoch'] == epoch:
+            if published['shape'][0] > max_row:
+                return published
+            if self._fits(matrix):
+                return self._append(matrix)
+        return self._allocate(matrix, epoch)
+
+    def _fits(self, matrix):
+        if matrix.shape[1] != self._published['shape'][1]:
+            return False
+        return all(
+            array.dtype == view.dtype and len(array) <= len(view)
+            for array, view in zip((matrix.data, matrix.indices, matrix.indptr), self._views)
+        )
+
+    def _append(self, matrix):
+        """Copy the rows added since the last publish into the spare capacity"""
+        published = self._published
+        rows = published['shape'][0]
+        nnz = int(matrix.indptr[rows])
+        data, indices, indptr = self._views
+        data[nnz:matrix.nnz] = matrix.data[nnz:]
+        indices[nnz:matrix.nnz] = matrix.indices[nnz:]
+        indptr[rows + 1:matrix.shape[0] + 1] = matrix.indptr[rows + 1:]
+        # Workers scoring against the old shape only read the unchanged prefix
+        self._published = dict(
+            published,
+            shape=matrix.shape,
+            arrays=[(name, dtype, len(array)) for (name, dtype, _), array in zip(
+                published['arrays'], (matrix.data, matrix.indices, matrix.indptr)
+            )],
+        )
+        return self._published
+
+    def _allocate(self, matrix, epoch):
+        """Copy ``matrix`` into new blocks with ``growth`` times its size"""
+        blocks, views, arrays = [], [], []
+        for array in (matrix.data, matrix.indices, matrix.indptr):
+            capacity = max(int(len(array) * self.growth), len(array) + 1)
+            block = shared_memory.SharedMemory(create=True, size=capacity * array.itemsize)
+            view = np.ndarray((capacity,), dtype=array.dtype, buffer=block.buf)
+            view[:len(array)] = array
+            blocks.append(block)
+            views.append(view)
+            arrays.append((block.name, array.dtype.str, len(array)))
+
+        # Keep the previous copy alive for requests still being scored against
+        # it; workers already mapping older blocks keep them until they re-attach
+        for block in self._retired:
+            block.close()
+            block.unlink()
+        self._retired = self._blocks
+        self._blocks = blocks
+        self._views = views
+        self._published = {
+            'key': blocks[0].name,
+            'epoch': epoch,
+            'shape': matrix.shape,
+            'arrays': arrays,
+        }
+        return self._published
+
+    def _submit(self, fn, matrix, epoch, rows, vec, *args):
+        """``[(start, future)]`` running ``fn`` over contiguous shards of ``rows``"""
+        vec = sp.csr_matrix(vec)
+        with self._lock:
+            meta = self._publish(matrix, epoch, int(rows.max()))
+        pool = self._get_pool()
+
+        bounds = np.linspace(0, len(rows), self.workers + 1).astype(np.int64)
+        return [
+            (start, pool.submit(fn, meta, rows[start:stop], vec.indices, vec.data, *args))
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+
+    def scores(self, matrix, epoch, rows, vec):
+        """Scores of every row in ``rows`` against ``vec``, in ``rows`` order"""
+        if not len(rows):
+            return np.empty(0)
+        futures = self._submit(_score_rows, matrix, epoch, rows, vec)
+        return np.concatenate([future.result() for _, future in futures])
+
+    def top_k(self, matrix, epoch, rows, vec, k):
+        """
+        Return ``(positions, scores, min, max)`` for the best ``k`` of ``rows``.
+
+        ``positions`` index into ``rows``; ``min``/``max`` span all scores so
+        callers can normalise exactly as an in-process pass would.
+        """
+        futures = self._submit(_score_shard, matrix, epoch, rows, vec, k)
+
+        positions, scores, lows, highs = [], [], [], []
+        for start, future in futures:
+            top, top_scores, low, high = future.result()
+            positions.append(top + start)
+            scores.append(top_scores)
+            if low is not None:
+                lows.append(low)
+                highs.append(high)
+
+        positions = np.concatenate(positions)
+        scores = np.concatenate(scores)
+        if k < len(scores):
+            keep = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[keep], scores[keep]
+        return positions, scores, min(lows), max(highs)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        self._views = []
+        self._published = None
+        for block in self._blocks + self._retired:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+        self._retired = []
+
+
+# Global instance
+sharded_scorer = ShardedScorer()
@@ -0,0 +1,105 @@
+import logging
+import threading
+
+import numpy as np
+
+
+class TagIndex:
+    """
+    In-memory inverted index from tag to the sorted ids of open jobs.
+
+    Mirrors ``job_tags`` for open jobs only, so "open jobs matching any of
+    these skills" is a union of posting lists rather than an ``EXISTS``
+    subquery over every job. Built lazily from the database and kept in sync
+    by the routes that create jobs or change their status.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._postings = {}
+        self._job_tags = {}
+        self._built = False
+        self._lock = threading.RLock()
+
+    def ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def rebuild(self):
+        from app import db
+        from app.models import Job, JobTag
+
+        rows = db.session.query(JobTag.tag, JobTag.job_id).join(
+            Job, Job.id == JobTag.job_id
+        ).filter(Job.status == 'open').order_by(JobTag.tag, JobTag.job_id).all()
+
+        postings, job_tags = {}, {}
+        for tag, job_id in rows:
+            postings.setdefault(tag, []).append(job_id)
+            job_tags.setdefault(job_id, set()).add(tag)
+
+        with self._lock:
+            self._postings = {tag: np.array(ids, dtype=np.int64) for tag, ids in postings.items()}
+            self._job_tags = job_tags
+            self._built = True
+        self.logger.info(f"Tag index built: {len(postings)} tags over {len(job_tags)} open jobs")
+
+    def add_job(self, job):
+        """Index an open job's tags; non-open jobs are removed"""
+        if job.status != 'open':
+            return self.remove_job(job.id)
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(job.id)
+            tags = {tag.tag for tag in job.tags}
+            for tag in tags:
+                ids = self._postings.get(tag)
+                if ids is None:
+                    self._postings[tag] = np.array([job.id], dtype=np.int64)
+                else:
+                    pos = np.searchsorted(ids, job.id)
+                    self._postings[tag] = np.insert(ids, pos, job.id)
+            if tags:
+                self._job_tags[job.id] = tags
+
+    update_job = add_job
+
+    def remove_job(self, job_id):
+        with self._lock:
+            if self._built:
+                self._remove(job_id)
+
+    def _remove(self, job_id):
+        for tag in self._job_tags.pop(job_id, ()):
+            ids = self._postings.get(tag)
+            if ids is None:
+                continue
+            pos = np.searchsorted(ids, job_id)
+            if pos < len(ids) and ids[pos] == job_id:
+                ids = np.delete(ids, pos)
+            if len(ids):
+                self._postings[tag] = ids
+            else:
+                del self._postings[tag]
+
+    def postings(self, tag):
+        """Sorted ids of open jobs tagged ``tag``"""
+        self.ensure_built()
+        return self._postings.get(tag.lower(), np.empty(0, dtype=np.int64))
+
+    def jobs_matching_any(self, tags, exclude=None):
+        """Sorted ids of open jobs carrying at least one of ``tags``"""
+        self.ensure_built()
+        with self._lock:
+            lists = [self._postings[tag.lower()] for tag in tags if tag.lower() in self._postings]
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        ids = np.unique(np.concatenate(lists))
+        if exclude:
+            ids = ids[~np.isin(ids, np.fromiter(exclude, dtype=np.int64))]
+        return ids
+
+
+# Global instance
+tag_index = TagIndex()
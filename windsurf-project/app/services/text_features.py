@@ -0,0 +1,177 @@
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# Indic blocks, so n-grams never straddle scripts (and \w's gaps for
+# combining vowel signs/viramas don't split words)
+_SCRIPT_BLOCKS = (
+    (0x0900, 0x097F, 'deva'),
+    (0x0980, 0x09FF, 'beng'),
+    (0x0A00, 0x0A7F, 'guru'),
+    (0x0A80, 0x0AFF, 'gujr'),
+    (0x0B00, 0x0B7F, 'orya'),
+    (0x0B80, 0x0BFF, 'taml'),
+    (0x0C00, 0x0C7F, 'telu'),
+    (0x0C80, 0x0CFF, 'knda'),
+    (0x0D00, 0x0D7F, 'mlym'),
+)
+_WORD_RE = re.compile(r'[\w\u0900-\u0D7F]+')
+_CHAR_NGRAMS = (2, 3, 4)
+
+
+def _script(ch):
+    code = ord(ch)
+    for start, end, name in _SCRIPT_BLOCKS:
+        if start <= code <= end:
+            return name
+    return 'latn'
+
+
+def _script_runs(word):
+    """Split a token wherever the script changes"""
+    runs, start = [], 0
+    for i in range(1, len(word)):
+        if _script(word[i]) != _script(word[i - 1]):
+            runs.append(word[start:i])
+            start = i
+    runs.append(word[start:])
+    return runs
+
+
+def normalize_text(value):
+    """NFC, case-folded and whitespace-collapsed, for lookup keys"""
+    return ' '.join(unicodedata.normalize('NFC', value or '').casefold().split())
+
+
+def analyze(text):
+    """
+    Script-aware features: word unigrams/bigrams plus character 2-4 grams
+    inside each same-script run. Deterministic and stateless.
+    """
+    text = unicodedata.normalize('NFC', text or '').casefold()
+    words = [run for token in _WORD_RE.findall(text) for run in _script_runs(token)]
+    words = [word for word in words if word not in ENGLISH_STOP_WORDS]
+
+    features = [f"w:{word}" for word in words]
+    features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        for n in _CHAR_NGRAMS:
+            features += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    return features
+
+
+class TfidfTextEngine:
+    """Fitted TF-IDF vocabulary (word unigrams and bigrams)"""
+
+    name = 'tfidf'
+
+    def __init__(self):
+        self.vectorizer = None
+        self.fingerprint = None
+
+    def fitted(self, texts):
+        """Return ``(engine, matrix)``: a new engine fit on ``texts`` and its rows"""
+        engine = TfidfTextEngine()
+        engine.vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+        try:
+            matrix = engine.vectorizer.fit_transform(texts).tocsr()
+        except ValueError:
+            # Empty corpus (or only stop words): keep an empty vocabulary
+            engine.vectorizer.fit(['placeholder'])
+            matrix = sp.csr_matrix((0, len(engine.vectorizer.vocabulary_)))
+        # Stable across processes/restarts
+        engine.fingerprint = hashlib.sha1(
+            '\n'.join(engine.vectorizer.get_feature_names_out()).encode('utf-8')
+        ).hexdigest()
+        return engine, matrix
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+
+    @property
+    def n_features(self):
+        return len(self.vectorizer.vocabulary_) if self.vectorizer is not None else 0
+
+
+class HashingTextEngine:
+    """
+    Stateless feature-hashing engine with a fixed output dimension.
+
+    Features from :func:`analyze` are hashed (murmurhash3, fixed seed) into
+    ``n_features`` columns, so every process produces identical vectors with
+    no fitting and memory does not grow with the corpus. Counts are
+    sublinear-scaled, weighted by an IDF vector loaded from ``idf_path``
+    (refreshed out of band by ``flask matching refresh-idf``) and
+    L2-normalised. Without an IDF file all features weigh 1.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, n_features=2 ** 20, idf_path=None):
+        self.logger = logging.getLogger(__name__)
+        self.n_features = n_features
+        self.idf_path = idf_path
+        self.idf = None
+        self.fingerprint = f"hashing-{n_features}-noidf"
+        self.hasher = HashingVectorizer(
+            analyzer=analyze, n_features=n_features, alternate_sign=False,
+            norm=None, dtype=np.float32
+        )
+
+    def load_idf(self):
+        if not self.idf_path or not os.path.exists(self.idf_path):
+            return
+        idf = np.load(self.idf_path)
+        if idf.shape != (self.n_features,):
+            self.logger.error(f"Ignoring IDF at {self.idf_path}: shape {idf.shape} != ({self.n_features},)")
+            return
+        self.idf = idf.astype(np.float32)
+        self.fingerprint = f"hashing-{self.n_features}-{hashlib.sha1(self.idf.tobytes()).hexdigest()}"
+
+    def fitted(self, texts):
+        """Nothing to fit: reload the IDF and vectorise ``texts``"""
+        engine = HashingTextEngine(self.n_features, self.idf_path)
+        engine.load_idf()
+        return engine, engine.transform(texts)
+
+    def transform(self, texts):
+        counts = self.hasher.transform(texts).tocsr()
+        counts.data = np.log1p(counts.data)
+        if self.idf is not None:
+            counts = counts @ sp.diags(self.idf)
+        return normalize(counts, norm='l2', copy=False).tocsr()
+
+    def refresh_idf(self, text_chunks):
+        """
+        Compute smoothed IDF from an iterable of text chunks and write it to
+        ``idf_path``. Memory is one document-frequency vector.
+        """
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n_docs = 0
+        for texts in text_chunks:
+            counts = self.hasher.transform(texts).tocsc()
+            df += np.diff(counts.indptr)
+            n_docs += len(texts)
+        idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+
+        tmp_path = f"{self.idf_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, idf)
+        os.replace(tmp_path, self.idf_path)
+        return n_docs
+
+
+def make_engine(name, n_features=2 ** 20, idf_path=None):
+    if name == 'hashing':
+        return HashingTextEngine(n_features=n_features, idf_path=idf_path)
+    if name == 'tfidf':
+        return TfidfTextEngine()
+    raise ValueError(f"Unknown matching vectorizer: {name}")
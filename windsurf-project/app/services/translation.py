@@ -1,4 +1,7 @@
 from flask import current_app
+from app.services.translation_cache import translation_cache
+from app.services.translation_batcher import translation_batcher
+from app.services.model_registry import model_registry
 try:
     from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
     import torch
@@ -11,7 +14,6 @@ except Exception:
 
 class TranslationService:
     def __init__(self):
-        self.models = {}
         self.supported_languages = {
             'en': 'English',
             'hi': 'Hindi', 
@@ -52,6 +54,7 @@ class TranslationService:
                 'description': 'Description',
                 'budget_inr': 'Budget (INR)',
                 'location': 'Location',
+                'job_tags': 'Skills needed (comma separated)',
                 'job_matches': 'Job Matches',
                 'manage_skills': 'Manage Skills',
                 'work_tags': 'Work Tags (comma separated)',
@@ -93,6 +96,7 @@ class TranslationService:
                 'description': 'विवरण',
                 'budget_inr': 'बजट (₹)',
                 'location': 'स्थान',
+                'job_tags': 'आवश्यक कौशल (अल्पविराम से अलग करें)',
                 'job_matches': 'नौकरी मिलान',
                 'manage_skills': 'कौशल प्रबंधन',
                 'work_tags': 'कार्य टैग (अल्पविराम से अलग)',
@@ -370,6 +374,16 @@ class TranslationService:
         except Exception:
             return key
         
+    def model_name(self, source_lang, target_lang):
+        """Model id used for a language pair (also the translation cache's model key)"""
+        # Use IndicTrans2 for Indian language translations
+        if source_lang in ['hi', 'ta', 'te', 'kn', 'bn', 'mr', 'gu'] or target_lang in ['hi', 'ta', 'te', 'kn', 'bn', 'mr', 'gu']:
+            if target_lang != 'en':
+                return "ai4bharat/indictrans2-en-indic-1B"
+            return "ai4bharat/indictrans2-indic-en-1B"
+        # Use mBART for other translations
+        return "facebook/mbart-large-50-many-to-many-mmt"
+        
     def load_model(self, source_lang, target_lang):
         """Load translation model for specific language pair"""
         if not _HAS_ML:
@@ -379,67 +393,72 @@ class TranslationService:
             except Exception:
                 pass
             return None
-        model_key = f"{source_lang}_{target_lang}"
-        
-        if model_key not in self.models:
-            try:
-                # Use IndicTrans2 for Indian language translations
-                if source_lang in ['hi', 'ta', 'te', 'kn', 'bn', 'mr', 'gu'] or target_lang in ['hi', 'ta', 'te', 'kn', 'bn', 'mr', 'gu']:
-                    model_name = "ai4bharat/indictrans2-indic-en-1B"
-                    if target_lang != 'en':
-                        model_name = "ai4bharat/indictrans2-en-indic-1B"
-                else:
-                    # Use mBART for other translations
-                    model_name = "facebook/mbart-large-50-many-to-many-mmt"
-                
-                tokenizer = AutoTokenizer.from_pretrained(model_name)
-                model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-                
-                self.models[model_key] = {
-                    'tokenizer': tokenizer,
-                    'model': model,
-                    'pipeline': pipeline('translation', model=model, tokenizer=tokenizer)
-                }
-            except Exception as e:
-                current_app.logger.error(f"Error loading translation model {model_key}: {str(e)}")
-                return None
-                
-        return self.models.get(model_key)
+        # One shared instance per checkpoint, whatever the language pair
+        model_name = self.model_name(source_lang, target_lang)
+        try:
+            return model_registry.get(model_name, self._load_model_by_name)
+        except Exception as e:
+            current_app.logger.error(f"Error loading translation model {model_name}: {str(e)}")
+            return None
+    
+    def _load_model_by_name(self, model_name):
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        return {
+            'tokenizer': tokenizer,
+            'model': model,
+            'pipeline': pipeline('translation', model=model, tokenizer=tokenizer)
+        }
     
     def translate_text(self, text, source_lang, target_lang):
         """Translate text from source language to target language"""
-        if not _HAS_ML:
-            return text
         if source_lang == target_lang:
             return text
-            
-        model_info = self.load_model(source_lang, target_lang)
-        if not model_info:
-            return text  # Return original text if translation fails
+        
+        # Repeated messages and stock phrases are served from the cache
+        model_id = self.model_name(source_lang, target_lang)
+        cached = translation_cache.get(text, source_lang, target_lang, model_id)
+        if cached is not None:
+            return cached
+        if not _HAS_ML:
+            return text
             
         try:
-            # Prepare input based on model type
-            if 'indictrans' in str(model_info['model']):
-                # IndicTrans2 specific formatting
-                if source_lang != 'en':
-                    text = f"{source_lang}: {text}"
-                
-                inputs = model_info['tokenizer'](text, return_tensors="pt", padding=True, truncation=True)
-                
-                with torch.no_grad():
-                    outputs = model_info['model'].generate(**inputs, max_length=512)
-                
-                translated = model_info['tokenizer'].decode(outputs[0], skip_special_tokens=True)
+            # Concurrent requests for the same model and languages share one generate()
+            if current_app.config.get('TRANSLATION_BATCHING', True):
+                translated = translation_batcher.translate(model_id, text, source_lang, target_lang)
             else:
-                # mBART translation
-                result = model_info['pipeline'](text, src_lang=source_lang, tgt_lang=target_lang)
-                translated = result[0]['translation_text']
-                
-            return translated
-            
+                translated = self.generate_batch([text], source_lang, target_lang)[0]
         except Exception as e:
             current_app.logger.error(f"Translation error: {str(e)}")
             return text  # Return original text if translation fails
+        
+        translation_cache.put(text, source_lang, target_lang, model_id, translated)
+        return translated
+    
+    def generate_batch(self, texts, source_lang, target_lang):
+        """Translate a list of texts with one padded forward pass; raises on failure"""
+        model_info = self.load_model(source_lang, target_lang)
+        if not model_info:
+            raise RuntimeError(f"No translation model for {source_lang} -> {target_lang}")
+            
+        # Prepare input based on model type
+        if 'indictrans' in str(model_info['model']):
+            # IndicTrans2 specific formatting
+            prompts = [f"{source_lang}: {text}" if source_lang != 'en' else text for text in texts]
+            
+            inputs = model_info['tokenizer'](prompts, return_tensors="pt", padding=True, truncation=True)
+            
+            with torch.no_grad():
+                outputs = model_info['model'].generate(**inputs, max_length=512)
+            
+            return model_info['tokenizer'].batch_decode(outputs, skip_special_tokens=True)
+        
+        # mBART translation
+        results = model_info['pipeline'](
+            list(texts), src_lang=source_lang, tgt_lang=target_lang, batch_size=len(texts)
+        )
+        return [result['translation_text'] for result in results]
     
     def detect_language(self, text):
         """Detect the language of given text"""
@@ -0,0 +1,138 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class _Request:
+    __slots__ = ('text', 'future', 'queued_at')
+
+    def __init__(self, text):
+        self.text = text
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+
+class TranslationBatcher:
+    """
+    Micro-batching executor for model translations.
+
+    Requests queue per (model, source, target); one worker thread per queue
+    takes the oldest request, keeps collecting until ``max_batch_size``
+    requests or ``max_wait`` seconds after that request arrived, then runs
+    a single padded ``generate`` over the batch and resolves each caller's
+    future. Under load batches fill up and the model is used at batch
+    throughput; a lone request waits at most ``max_wait``. Per-request
+    latency (queue wait plus inference) and batch sizes are kept for
+    :meth:`stats`.
+    """
+
+    def __init__(self, max_batch_size=16, max_wait=0.01, timeout=60.0, window=2000):
+        self.logger = logging.getLogger(__name__)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.app = None
+        self._queues = {}
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._batches = 0
+        self._failed = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.max_batch_size = app.config.get('TRANSLATION_BATCH_SIZE', self.max_batch_size)
+        self.max_wait = app.config.get('TRANSLATION_BATCH_WAIT_MS', self.max_wait * 1000) / 1000
+        self.timeout = app.config.get('TRANSLATION_TIMEOUT', self.timeout)
+
+    def _queue(self, key):
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = self._queues[key] = queue.Queue()
+                threading.Thread(
+                    target=self._worker, args=(key, q), name=f"translate-{key[1]}-{key[2]}", daemon=True
+                ).start()
+            return q
+
+    def translate(self, model_id, text, source_lang, target_lang):
+        """Translated ``text``; blocks until its batch has run"""
+        request = _Request(text)
+        self._queue((model_id, source_lang, target_lang)).put(request)
+        return request.future.result(timeout=self.timeout)
+
+    def _collect(self, q):
+        batch = [q.get()]
+        deadline = batch[0].queued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(q.get(timeout=remaining) if remaining > 0 else q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self, key, q):
+        from app.services.translation import translation_service
+
+        _, source_lang, target_lang = key
+        while True:
+            batch = self._collect(q)
+            try:
+                with self.app.app_context():
+                    outputs = translation_service.generate_batch(
+                        [request.text for request in batch], source_lang, target_lang
+                    )
+            except Exception as e:
+                self.logger.error(f"Translation batch of {len(batch)} failed: {str(e)}")
+                with self._lock:
+                    self._failed += len(batch)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            done = time.monotonic()
+            outputs = list(outputs)
+            for request, output in zip(batch, outputs):
+                request.future.set_result(output)
+            if len(outputs) != len(batch):
+                self.logger.error(f"Translation batch of {len(batch)} returned {len(outputs)} outputs")
+                error = RuntimeError(f"Translation batch returned {len(outputs)} outputs for {len(batch)} inputs")
+                for request in batch[len(outputs):]:
+                    request.future.set_exception(error)
+            with self._lock:
+                self._failed += max(len(batch) - len(outputs), 0)
+                self._batches += 1
+                self._batch_sizes.append(len(batch))
+                self._latencies.extend(done - request.queued_at for request in batch)
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=float)
+            sizes = np.array(self._batch_sizes, dtype=float)
+            stats = {
+                'queues': {f"{model}:{source}->{target}": q.qsize() for (model, source, target), q in self._queues.items()},
+                'batches': self._batches,
+                'failed': self._failed,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+            }
+        if len(sizes):
+            stats['mean_batch_size'] = round(float(sizes.mean()), 2)
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99])
+            stats['latency_ms'] = {
+                'p50': round(float(p50) * 1000, 1),
+                'p99': round(float(p99) * 1000, 1),
+                'samples': int(len(latencies)),
+            }
+        return stats
+
+
+# Global instance
+translation_batcher = TranslationBatcher()
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+# Rough per-entry overhead of the key, tuple and OrderedDict node
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def normalize_source(text):
+    """NFC with whitespace collapsed; case is kept since it can change the output"""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+class TranslationCache:
+    """
+    Two-level cache of machine translations.
+
+    Keys are the SHA-256 of (normalised text, source, target, model id), so
+    the same chat message or stock phrase is translated once per model. The
+    first level is a per-process LRU bounded by ``max_bytes`` of UTF-8
+    output; the second is the ``translation_cache`` table shared by all
+    processes. A table hit is promoted into the LRU. ``invalidate`` drops
+    every entry of a model id, for when a model is upgraded.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, persist=True):
+        self.logger = logging.getLogger(__name__)
+        self.max_bytes = max_bytes
+        self.persist = persist
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('TRANSLATION_CACHE_BYTES', self.max_bytes)
+        self.persist = app.config.get('TRANSLATION_CACHE_PERSIST', self.persist)
+
+    def key(self, text, source_lang, target_lang, model_id):
+        raw = '\x1f'.join((model_id, source_lang, target_lang, normalize_source(text)))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _remember(self, key, model_id, translated):
+        size = len(translated.encode('utf-8')) + ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._lru[key] = (model_id, translated, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._lru.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def get(self, text, source_lang, target_lang, model_id):
+        """Cached translation, or ``None``"""
+        key = self.key(text, source_lang, target_lang, model_id)
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        translated = self._read(key) if self.persist else None
+        with self._lock:
+            if translated is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+        self._remember(key, model_id, translated)
+        return translated
+
+    def put(self, text, source_lang, target_lang, model_id, translated):
+        key = self.key(text, source_lang, target_lang, model_id)
+        self._remember(key, model_id, translated)
+        if self.persist:
+            self._write(key, model_id, source_lang, target_lang, translated)
+
+    def _read(self, key):
+        from app import db
+        from app.models import TranslationCacheEntry
+
+        table = TranslationCacheEntry.__table__
+        try:
+            with db.engine.connect() as conn:
+                return conn.execute(
+                    select(table.c.translated_text).where(table.c.key_hash == key)
+                ).scalar()
+        except Exception as e:
+            self.logger.error(f"Translation cache read failed: {str(e)}")
+            return None
+
+    def _write(self, key, model_id, source_lang, target_lang, translated):
+        from app import db
+        from app.models import TranslationCacheEntry
+
+        table = TranslationCacheEntry.__table__
+        # Own transaction, so the caller's session is never committed here
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(table.insert().values(
+                    key_hash=key, model_id=model_id, source_lang=source_lang,
+                    target_lang=target_lang, translated_text=translated,
+                ))
+        except IntegrityError:
+            pass  # Another process stored the same translation first
+        except Exception as e:
+            self.logger.error(f"Translation cache write failed: {str(e)}")
+
+    def invalidate(self, model_id):
+        """Drop every cached translation made by ``model_id``; returns rows deleted"""
+        from app import db
+        from app.models import TranslationCacheEntry
+
+        with self._lock:
+            for key in [key for key, entry in self._lru.items() if entry[0] == model_id]:
+                self._bytes -= self._lru.pop(key)[2]
+
+        table = TranslationCacheEntry.__table__
+        with db.engine.begin() as conn:
+            deleted = conn.execute(table.delete().where(table.c.model_id == model_id)).rowcount
+        self.logger.info(f"Translation cache invalidated for {model_id}: {deleted} rows")
+        return deleted
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.db_hits + self.misses
+            return {
+                'hits': self.hits,
+                'db_hits': self.db_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.db_hits) / lookups, 4) if lookups else None,
+                'entries': len(self._lru),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+
+# Global instance
+translation_cache = TranslationCache()
@@ -0,0 +1,150 @@
+import logging
+import threading
+
+from app.services.text_features import normalize_text
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        # [(weight, key)], best first, at most PrefixIndex.top_k entries
+        self.top = []
+
+
+class PrefixIndex:
+    """
+    Popularity-weighted prefix trie.
+
+    Terms are keyed by :func:`normalize_text` and inserted under their full
+    key and under each later word, so "repair" completes "Leak repair". Each
+    node keeps the ``top_k`` best terms below it, so a completion is one walk
+    down the prefix. Weights only grow between rebuilds, which keeps the
+    per-node lists exact under incremental updates. Keys are indexed to
+    ``max_depth`` code points (NFC, so Indic syllables type in naturally).
+    """
+
+    def __init__(self, top_k=10, max_depth=32):
+        self.top_k = top_k
+        self.max_depth = max_depth
+        self.root = _Node()
+        # key -> [weight, display]
+        self.terms = {}
+
+    @staticmethod
+    def _entry_points(key):
+        words = key.split(' ')
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def _offer(self, node, key, weight):
+        # Lists are replaced, never mutated, so readers need no lock
+        top = [item for item in node.top if item[1] != key]
+        if len(top) == len(node.top) and len(top) >= self.top_k:
+            worst = top[-1]
+            if (-weight, key) > (-worst[0], worst[1]):
+                return
+            top.pop()
+        top.append((weight, key))
+        node.top = sorted(top, key=lambda item: (-item[0], item[1]))
+
+    def add(self, text, weight=1):
+        """Add ``weight`` to a term, inserting it if new"""
+        key = normalize_text(text)
+        if not key:
+            return
+        term = self.terms.get(key)
+        if term is None:
+            term = self.terms[key] = [0, text.strip()]
+        term[0] += weight
+
+        for entry in self._entry_points(key):
+            node = self.root
+            for ch in entry[:self.max_depth]:
+                node = node.children.setdefault(ch, _Node())
+                self._offer(node, key, term[0])
+
+    def complete(self, prefix, limit=10):
+        """``[(display, weight)]`` for the best terms under ``prefix``"""
+        node = self.root
+        for ch in normalize_text(prefix)[:self.max_depth]:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [(self.terms[key][1], weight) for weight, key in node.top[:limit]]
+
+
+class Typeahead:
+    """
+    In-memory completions for job titles, skill tags and state/district
+    names. Built from the database on first use; new jobs are folded in as
+    they are posted. Title and tag weights are job counts; places weigh one
+    plus the number of jobs located there.
+    """
+
+    KINDS = ('titles', 'skills', 'locations')
+
+    def __init__(self, top_k=10):
+        self.logger = logging.getLogger(__name__)
+        self.top_k = top_k
+        self.indexes = self._empty()
+        self._built = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.top_k = app.config.get('TYPEAHEAD_TOP_K', self.top_k)
+
+    def _empty(self):
+        return {kind: PrefixIndex(top_k=self.top_k) for kind in self.KINDS}
+
+    @staticmethod
+    def _places(location):
+        return [part.strip() for part in (location or '').split(',') if part.strip()]
+
+    def rebuild(self):
+        from app import db
+        from app.models import Job, JobTag
+        from app.services.district_list import get_local_state_districts_map
+
+        indexes = self._empty()
+        for state, districts in get_local_state_districts_map().items():
+            indexes['locations'].add(state)
+            for district in districts:
+                indexes['locations'].add(district)
+
+        for title, count in db.session.query(Job.title, db.func.count(Job.id)).group_by(Job.title):
+            indexes['titles'].add(title, count)
+        for tag, count in db.session.query(JobTag.tag, db.func.count(JobTag.id)).group_by(JobTag.tag):
+            indexes['skills'].add(tag, count)
+        for location, count in db.session.query(Job.location, db.func.count(Job.id)).group_by(Job.location):
+            for place in self._places(location):
+                indexes['locations'].add(place, count)
+
+        with self._lock:
+            self.indexes = indexes
+            self._built = True
+        self.logger.info(
+            f"Typeahead built: {', '.join(f'{len(index.terms)} {kind}' for kind, index in indexes.items())}"
+        )
+
+    def ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def add_job(self, job):
+        if not self._built:
+            return
+        with self._lock:
+            self.indexes['titles'].add(job.title)
+            for tag in job.tags:
+                self.indexes['skills'].add(tag.tag)
+            for place in self._places(job.location):
+                self.indexes['locations'].add(place)
+
+    def complete(self, prefix, kind, limit=10):
+        self.ensure_built()
+        return self.indexes[kind].complete(prefix, min(limit, self.top_k))
+
+
+# Global instance
+typeahead = Typeahead()
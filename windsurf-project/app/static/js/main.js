@@ -23,6 +23,7 @@ class KaamConnectUI {
     initializeSocketEvents() {
         this.socket.on('new_message', (msg) => this.handleNewMessage(msg));
         this.socket.on('new_application', (data) => this.handleJobApplication(data));
+        this.socket.on('location_resolved', (data) => this.handleLocationResolved(data));
         this.socket.on('notification', (notification) => this.showNotification(notification));
         this.socket.on('connect', () => this.handleConnection());
         this.socket.on('disconnect', () => this.handleDisconnection());
@@ -332,6 +333,14 @@ class KaamConnectUI {
         });
     }
 
+    handleLocationResolved(data) {
+        this.showNotification({
+            title: 'Location updated',
+            message: data.address,
+            type: 'info'
+        });
+    }
+
     // Language handling
     changeLanguage(lang) {
         this.applyLanguage(lang);
@@ -0,0 +1,4 @@
+# Performance benchmarks for KaamConnect services.
+#
+#   python -m benchmarks.matching --sizes 1000 10000 100000 --output bench_results.json
+#   python -m benchmarks.matching --baseline benchmarks/baseline.json --threshold 0.2
@@ -0,0 +1,149 @@
+"""
+Seeded synthetic marketplace: clients, workers with skills, open jobs with
+tags (English and Indic-script titles) and applications, with coordinates
+scattered around district centroids across India.
+
+The same seed always produces the same rows, so runs are comparable.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+TRADES = [
+    # (tag, English title words, Indic titles)
+    ('plumbing', ['Plumber', 'Pipe fitter', 'Leak repair'], ['प्लंबर चाहिए', 'குழாய் பழுது']),
+    ('electrician', ['Electrician', 'Wiring work', 'Fan installation'], ['बिजली मिस्त्री', 'ఎలక్ట్రీషియన్ కావాలి']),
+    ('painting', ['House painter', 'Wall painting', 'Putty work'], ['घर की पुताई', 'ಬಣ್ಣ ಹಚ್ಚುವ ಕೆಲಸ']),
+    ('carpentry', ['Carpenter', 'Furniture repair', 'Door fitting'], ['बढ़ई चाहिए', 'তক্তা মিস্ত্রি']),
+    ('driving', ['Driver', 'Delivery driver', 'Tempo driver'], ['ड्राइवर चाहिए', 'ડ્રાઇવર જોઈએ']),
+    ('cleaning', ['House cleaning', 'Office cleaner', 'Deep cleaning'], ['घर की सफाई', 'வீடு சுத்தம்']),
+    ('cooking', ['Cook', 'Tiffin cook', 'Event catering'], ['खाना बनाने वाला', 'స్వయంపాకం']),
+    ('masonry', ['Mason', 'Tile work', 'Brick laying'], ['राजमिस्त्री', 'ಗಾರೆ ಕೆಲಸ']),
+    ('tutoring', ['Maths tutor', 'English tutor', 'Home tuition'], ['गणित शिक्षक', 'গৃহশিক্ষক']),
+    ('tailoring', ['Tailor', 'Blouse stitching', 'Alteration work'], ['दर्जी चाहिए', 'દરજી']),
+    ('gardening', ['Gardener', 'Lawn care', 'Plant nursery help'], ['माली चाहिए', 'தோட்டக்காரர்']),
+    ('security', ['Security guard', 'Night watchman', 'Gate keeper'], ['चौकीदार', 'సెక్యూరిటీ గార్డ్']),
+]
+
+DESCRIPTION_WORDS = (
+    'urgent experienced reliable daily weekly contract immediate start tools provided '
+    'residential commercial apartment shop office site materials supplied half day full day '
+    'weekend evening morning skilled helper team licensed verified references required'
+).split()
+
+# (location, approximate district centroid)
+LOCATIONS = [
+    ('Mumbai, Maharashtra', 19.076, 72.878), ('Pune, Maharashtra', 18.520, 73.857),
+    ('Nagpur, Maharashtra', 21.146, 79.088), ('Bengaluru Urban, Karnataka', 12.972, 77.595),
+    ('Mysuru, Karnataka', 12.296, 76.639), ('New Delhi, Delhi', 28.614, 77.209),
+    ('Lucknow, Uttar Pradesh', 26.847, 80.947), ('Kanpur, Uttar Pradesh', 26.450, 80.332),
+    ('Chennai, Tamil Nadu', 13.083, 80.271), ('Coimbatore, Tamil Nadu', 11.017, 76.956),
+    ('Ahmedabad, Gujarat', 23.023, 72.571), ('Surat, Gujarat', 21.170, 72.831),
+    ('Kolkata, West Bengal', 22.573, 88.364), ('Jaipur, Rajasthan', 26.912, 75.787),
+    ('Patna, Bihar', 25.594, 85.138), ('Hyderabad, Telangana', 17.385, 78.487),
+    ('Kochi, Kerala', 9.931, 76.267), ('Bhopal, Madhya Pradesh', 23.260, 77.413),
+    ('Visakhapatnam, Andhra Pradesh', 17.687, 83.218), ('Ludhiana, Punjab', 30.901, 75.857),
+]
+
+# Points are scattered this many degrees (~15 km) around a district centroid
+JITTER_DEG = 0.15
+
+
+def _scatter(rng, lat, lng):
+    return round(lat + rng.uniform(-JITTER_DEG, JITTER_DEG), 6), round(lng + rng.uniform(-JITTER_DEG, JITTER_DEG), 6)
+
+
+def generate(n_jobs, seed=42, workers_per_job=0.2, clients_per_job=0.05, applications_per_worker=5):
+    """Return a dict of row lists (users, user_skills, jobs, job_tags, job_applications)"""
+    from app.services.geo import geohash_encode
+
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    n_workers = max(10, int(n_jobs * workers_per_job))
+    n_clients = max(5, int(n_jobs * clients_per_job))
+
+    users, skills = [], []
+    for i in range(n_clients + n_workers):
+        is_worker = i >= n_clients
+        user_id = i + 1
+        home, lat, lng = rng.choice(LOCATIONS)
+        lat, lng = _scatter(rng, lat, lng)
+        users.append({
+            'id': user_id,
+            'username': f"{'worker' if is_worker else 'client'}_{user_id}",
+            'email': f"user{user_id}@bench.local",
+            'user_type': 'worker' if is_worker else 'client',
+            'preferred_language': rng.choice(['en', 'hi', 'ta', 'te', 'kn', 'bn', 'mr', 'gu']),
+            'created_at': now,
+            'profile_updated_at': now,
+            'location': home,
+            'latitude': lat,
+            'longitude': lng,
+        })
+        if is_worker:
+            for tag, _, _ in rng.sample(TRADES, rng.randint(1, 3)):
+                skills.append({
+                    'user_id': user_id,
+                    'skill': tag,
+                    'experience_years': rng.randint(0, 10),
+                    'created_at': now,
+                })
+
+    jobs, tags = [], []
+    for job_id in range(1, n_jobs + 1):
+        trade, english, indic = rng.choice(TRADES)
+        title = rng.choice(indic) if rng.random() < 0.3 else rng.choice(english)
+        location, lat, lng = rng.choice(LOCATIONS)
+        lat, lng = _scatter(rng, lat, lng)
+        jobs.append({
+            'id': job_id,
+            'title': title,
+            'description': ' '.join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(8, 40))),
+            'budget': round(rng.lognormvariate(7.5, 0.8), -1),
+            'location': location,
+            'latitude': lat,
+            'longitude': lng,
+            'geohash': geohash_encode(lat, lng),
+            'status': 'open' if rng.random() < 0.85 else rng.choice(['in_progress', 'completed']),
+            'created_at': now - timedelta(minutes=n_jobs - job_id),
+            'user_id': rng.randint(1, n_clients),
+        })
+        job_tags = {trade}
+        if rng.random() < 0.3:
+            job_tags.add(rng.choice(TRADES)[0])
+        tags.extend({'job_id': job_id, 'tag': tag} for tag in job_tags)
+
+    applications = []
+    for user_id in range(n_clients + 1, n_clients + n_workers + 1):
+        for job_id in rng.sample(range(1, n_jobs + 1), min(n_jobs, rng.randint(0, applications_per_worker * 2))):
+            applications.append({
+                'job_id': job_id,
+                'user_id': user_id,
+                'status': 'pending',
+                'created_at': now + timedelta(minutes=rng.randint(0, 10000)),
+            })
+
+    return {
+        'users': users,
+        'user_skills': skills,
+        'jobs': jobs,
+        'job_tags': tags,
+        'job_applications': applications,
+    }
+
+
+def load(db, corpus, chunk_size=5000):
+    """Bulk-insert a generated corpus into the bound database"""
+    from app.models.user import User, UserSkill, Job, JobTag, JobApplication
+
+    for model, rows in (
+        (User, corpus['users']),
+        (UserSkill, corpus['user_skills']),
+        (Job, corpus['jobs']),
+        (JobTag, corpus['job_tags']),
+        (JobApplication, corpus['job_applications']),
+    ):
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(insert(model), rows[start:start + chunk_size])
+    db.session.commit()
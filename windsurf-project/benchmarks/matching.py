@@ -0,0 +1,219 @@
+"""
+Latency, memory and similar-jobs recall benchmark for JobMatchingService.
+
+Each corpus size runs in its own subprocess so peak RSS is per size. Results
+are written as JSON; with ``--baseline`` the run fails (exit 1) when a
+tracked metric is worse than the stored baseline by more than
+``--threshold`` (a fraction, 0.2 = 20%).
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# Lower is better for these tracked metrics, higher for HIGHER_TRACKED
+TRACKED = ('p50_ms', 'p95_ms', 'peak_rss_mb', 'vocabulary_size')
+HIGHER_TRACKED = ('recall_at_5',)
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _summary(samples):
+    import numpy as np
+
+    ms = np.array(samples) * 1000
+    return {
+        'runs': len(samples),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+    }
+
+
+def _timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def _similar_recall(targets, k=5):
+    """
+    Share of ``get_similar_jobs``' top ``k`` that are also in the exact top
+    ``k`` over every open job; ties with the ``k``-th exact score count.
+    """
+    import numpy as np
+
+    from app.models import Job
+    from app.services.job_index import job_index
+    from app.services.matching import job_matching_service
+
+    matrix, job_ids, alive = job_index.snapshot()
+    rows = np.flatnonzero(alive)
+    hits = total = 0
+    for job_id in targets:
+        vec = job_index.vectors_for([Job.query.get(job_id)])
+        exact = np.asarray((matrix[rows] @ vec.T).todense()).ravel()[job_ids[rows] != job_id]
+        if not len(exact):
+            continue
+        kth = np.sort(exact)[-min(k, len(exact))]
+        found = job_matching_service.get_similar_jobs(job_id, limit=k)
+        hits += sum(r['score'] >= kth - 1e-9 for r in found)
+        total += min(k, len(exact))
+    return round(hits / total, 3) if total else None
+
+
+def run_single(n_jobs, seed, repeats):
+    """Build a corpus of ``n_jobs`` in an in-memory database and time the service"""
+    import random
+
+    from config import Config
+    from app import create_app, db
+    from app.models import Job, User
+    from app.services.job_index import job_index
+    from app.services.location import location_service
+    from app.services.matching import job_matching_service
+    from app.services.profile_vectors import profile_vectors
+    from app.services.tag_index import tag_index
+    from benchmarks import corpus
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        JOB_INDEX_REFIT_INTERVAL = 0
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        corpus.load(db, corpus.generate(n_jobs, seed=seed))
+
+        start = time.perf_counter()
+        job_index.refit()
+        tag_index.rebuild()
+        index_build = time.perf_counter() - start
+
+        rng = random.Random(seed)
+        worker_ids = [u.id for u in User.query.filter_by(user_type='worker').all()]
+        open_ids = [j.id for j in Job.query.filter_by(status='open').all()]
+        workers = [User.query.get(i) for i in rng.sample(worker_ids, min(repeats, len(worker_ids)))]
+        targets = rng.sample(open_ids, min(repeats, len(open_ids)))
+        points = [(u.latitude, u.longitude) for u in workers]
+        candidates = Job.query.filter_by(status='open').all()
+
+        # Cold profiles each run: the profile cache is measured separately below
+        def similarity(user):
+            profile_vectors.invalidate(user.id)
+            job_matching_service.calculate_similarity(user, candidates, top_n=20)
+
+        results = {
+            'jobs': n_jobs,
+            'open_jobs': len(open_ids),
+            'index_build_s': round(index_build, 3),
+            'calculate_similarity': _timed(similarity, [(u,) for u in workers]),
+            'get_job_recommendations': _timed(
+                job_matching_service.get_job_recommendations, [(u,) for u in workers]
+            ),
+            'get_similar_jobs': dict(
+                _timed(job_matching_service.get_similar_jobs, [(j,) for j in targets]),
+                recall_at_5=_similar_recall(targets, k=5),
+            ),
+            'get_nearby_jobs': _timed(location_service.get_nearby_jobs, [(lat, lng, 10.0) for lat, lng in points]),
+            'vocabulary_size': job_index.vocabulary_size,
+        }
+        results['peak_rss_mb'] = _peak_rss_mb()
+    return results
+
+
+def _flatten(results):
+    """``{size: {metric_path: value}}`` for the tracked metrics"""
+    flat = {}
+    for entry in results['sizes']:
+        metrics = {}
+        for key, value in entry.items():
+            if isinstance(value, dict):
+                for sub, sub_value in value.items():
+                    if sub in TRACKED + HIGHER_TRACKED and sub_value is not None:
+                        metrics[f"{key}.{sub}"] = sub_value
+            elif key in TRACKED + HIGHER_TRACKED and value is not None:
+                metrics[key] = value
+        flat[str(entry['jobs'])] = metrics
+    return flat
+
+
+def compare(results, baseline, threshold):
+    """Return a list of human-readable regressions"""
+    regressions = []
+    current, previous = _flatten(results), _flatten(baseline)
+    for size, metrics in current.items():
+        for metric, value in metrics.items():
+            old = previous.get(size, {}).get(metric)
+            if not old:
+                continue
+            if metric.rsplit('.', 1)[-1] in HIGHER_TRACKED:
+                worse = value < old * (1 - threshold)
+            else:
+                worse = value > old * (1 + threshold)
+            if worse:
+                regressions.append(
+                    f"{size} jobs {metric}: {value} vs baseline {old} ({(value / old - 1) * 100:+.0f}%)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=50, help='Timed calls per operation')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help='Fail if worse than this results file')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--save-baseline', action='store_true', help='Also write results to --baseline')
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(run_single(args.single, args.seed, args.repeats)))
+        return 0
+
+    results = {'seed': args.seed, 'repeats': args.repeats, 'python': sys.version.split()[0], 'sizes': []}
+    for size in args.sizes:
+        print(f"Benchmarking {size} jobs ...", file=sys.stderr)
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.matching', '--single', str(size),
+             '--seed', str(args.seed), '--repeats', str(args.repeats)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        results['sizes'].append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        baseline_path = Path(args.baseline)
+        if args.save_baseline:
+            baseline_path.write_text(json.dumps(results, indent=2), encoding='utf-8')
+            print(f"Saved baseline {baseline_path}", file=sys.stderr)
+            return 0
+        regressions = compare(results, json.loads(baseline_path.read_text(encoding='utf-8')), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -10,9 +10,95 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Accounts (by email, comma-separated) allowed to read operational metrics
+    ADMIN_EMAILS = {
+        email.strip().lower() for email in os.environ.get('ADMIN_EMAILS', '').split(',') if email.strip()
+    }
+    
     # Socket.IO Configuration
     SOCKETIO_MESSAGE_QUEUE = os.environ.get('REDIS_URL') or None
     
+    # Job Matching
+    # Seconds between scheduled vocabulary refits of the job index (0 disables)
+    JOB_INDEX_REFIT_INTERVAL = int(os.environ.get('JOB_INDEX_REFIT_INTERVAL', 3600))
+    # Text engine for the job index: 'tfidf' (fitted vocabulary) or 'hashing'
+    # (fixed-size, fit-free, script-aware; IDF refreshed by `flask matching refresh-idf`)
+    MATCHING_VECTORIZER = os.environ.get('MATCHING_VECTORIZER', 'tfidf')
+    HASHING_N_FEATURES = 2 ** 20
+    HASHING_IDF_PATH = os.path.join(basedir, 'instance', 'hashing_idf.npy')
+    # Similar-jobs LSH: more tables/probes or fewer bits raise recall at the
+    # cost of latency (check recall@k in benchmarks/matching.py when tuning)
+    SIMILAR_JOBS_ANN_TABLES = 24
+    SIMILAR_JOBS_ANN_BITS = 6
+    SIMILAR_JOBS_ANN_PROBES = 2
+    # Probes with fewer than OVERSAMPLE x limit candidates, or more than this
+    # fraction of open jobs, are rescored exactly
+    SIMILAR_JOBS_ANN_OVERSAMPLE = 20
+    SIMILAR_JOBS_ANN_MAX_FRACTION = 0.5
+    # Below this many open jobs similar-jobs is scored exactly
+    SIMILAR_JOBS_EXACT_THRESHOLD = 5000
+    # Default page size of the cursor-paginated job feeds (?limit= overrides)
+    JOBS_PAGE_SIZE = 20
+    # Job search result cache: entries per process and seconds to live
+    SEARCH_CACHE_SIZE = 2048
+    SEARCH_CACHE_TTL = 60
+    # Completions kept per prefix for typeahead and /skills/suggest
+    TYPEAHEAD_TOP_K = 10
+    # Geocoding: upstream by import path (swap for a stub in tests), cache
+    # TTLs for hits and misses, reverse-lookup rounding, upstream pacing
+    GEOCODER = os.environ.get('GEOCODER', 'app.services.geocoding:NominatimGeocoder')
+    GEOCODE_TTL_DAYS = 30
+    GEOCODE_NEGATIVE_TTL_HOURS = 24
+    GEOCODE_COORD_PRECISION = 4
+    GEOCODE_RATE_PER_SECOND = 1.0
+    GEOCODE_MAX_WAIT = 5.0
+    # Background reverse geocoding for /location/update: worker threads,
+    # retries per lookup and exponential backoff (seconds, doubled per retry)
+    REVERSE_GEOCODE_WORKERS = 2
+    REVERSE_GEOCODE_RETRIES = 3
+    REVERSE_GEOCODE_BACKOFF = 2.0
+    REVERSE_GEOCODE_MAX_BACKOFF = 60.0
+    # Finest geohash prefix with job density counters (6 is about 1.2 x 0.6 km)
+    JOB_DENSITY_MAX_PRECISION = 6
+    # `flask geo-backfill`: rows per batch, geocoding threads, and the
+    # checkpoint file (defaults to instance/geo_backfill.json)
+    GEO_BACKFILL_CHUNK_SIZE = 500
+    GEO_BACKFILL_WORKERS = 4
+    GEO_BACKFILL_CHECKPOINT = os.environ.get('GEO_BACKFILL_CHECKPOINT')
+    # State/district centroid CSV; defaults to the bundled app/services/india_centroids.csv
+    GAZETTEER_PATH = os.environ.get('GAZETTEER_PATH')
+    # Machine translation cache: in-process LRU budget (bytes of output) and
+    # whether translations are also stored in the translation_cache table
+    TRANSLATION_CACHE_BYTES = 32 * 1024 * 1024
+    TRANSLATION_CACHE_PERSIST = True
+    # Micro-batching of model translations: largest batch per generate(), how
+    # long the first request waits for company (ms), and the caller timeout (s)
+    TRANSLATION_BATCHING = True
+    TRANSLATION_BATCH_SIZE = 16
+    TRANSLATION_BATCH_WAIT_MS = 10
+    TRANSLATION_TIMEOUT = 60
+    # Memory budget for loaded translation models; least recently used
+    # checkpoints are evicted past it (a 1B-parameter fp32 model is ~4 GB)
+    TRANSLATION_MODEL_MEMORY_MB = int(os.environ.get('TRANSLATION_MODEL_MEMORY_MB', 8192))
+    # Offline recommendation batches (`flask recommendations build`)
+    RECOMMENDATIONS_TOP_N = 50
+    RECOMMENDATIONS_CHUNK_SIZE = 256
+    # User profile vectors: in-memory LRU size, decayed application window,
+    # and whether to also persist them in user_profile_vectors
+    PROFILE_VECTOR_CACHE_SIZE = 10000
+    PROFILE_HISTORY_WINDOW = 20
+    PROFILE_HISTORY_DECAY = 0.85
+    PROFILE_VECTOR_PERSIST = os.environ.get('PROFILE_VECTOR_PERSIST', '').lower() in ('1', 'true', 'yes')
+    # Recommendation ranking: blend of text similarity, distance, budget fit
+    # and skill overlap; distance score halves roughly every 0.7 * scale km
+    RANKING_WEIGHTS = {'text': 0.6, 'distance': 0.2, 'budget': 0.1, 'skills': 0.1}
+    RANKING_DISTANCE_SCALE_KM = 25.0
+    # Users whose full ranked recommendation list is kept for paging
+    RECOMMENDATION_PAGE_CACHE_SIZE = 64
+    # Candidate sets at least this large are scored across a process pool
+    SHARDED_SCORING_THRESHOLD = 20000
+    SHARDED_SCORING_WORKERS = int(os.environ.get('SHARDED_SCORING_WORKERS', 0)) or None
+    
     # Language Support
     SUPPORTED_LANGUAGES = {
         'en': 'English',
@@ -45,6 +45,23 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Full-text search objects created by raw SQL (app/services/search_index.py);
+# they have no model, so autogenerate must not treat them as drift
+SEARCH_INDEX_TABLE_PREFIX = 'jobs_fts'
+SEARCH_INDEX_COLUMNS = {('jobs', 'search_vector')}
+SEARCH_INDEX_INDEXES = {'ix_jobs_search_vector'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith(SEARCH_INDEX_TABLE_PREFIX):
+        return False
+    if type_ == 'column' and (object.table.name, name) in SEARCH_INDEX_COLUMNS:
+        return False
+    if type_ == 'index' and name in SEARCH_INDEX_INDEXES:
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +82,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +111,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,74 @@
+"""add jobs search index
+
+Revision ID: e4b7a2d9c318
+Revises: c61d0e8f4a27
+Create Date: 2026-10-17 12:41:36.207815
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7a2d9c318'
+down_revision = 'c61d0e8f4a27'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({0}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({0}description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce({0}location, '')), 'C')"
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("""CREATE VIRTUAL TABLE jobs_fts USING fts5(
+            title, description, location,
+            content='jobs', content_rowid='id',
+            tokenize="unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+        )""")
+        op.execute("""CREATE TRIGGER jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, title, description, location)
+            VALUES (new.id, new.title, new.description, new.location);
+        END""")
+        op.execute("""CREATE TRIGGER jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location)
+            VALUES ('delete', old.id, old.title, old.description, old.location);
+        END""")
+        op.execute("""CREATE TRIGGER jobs_fts_au AFTER UPDATE OF title, description, location ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location)
+            VALUES ('delete', old.id, old.title, old.description, old.location);
+            INSERT INTO jobs_fts(rowid, title, description, location)
+            VALUES (new.id, new.title, new.description, new.location);
+        END""")
+        op.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute("ALTER TABLE jobs ADD COLUMN search_vector tsvector")
+        op.execute(f"""CREATE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format('NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql""")
+        op.execute("""CREATE TRIGGER jobs_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, description, location ON jobs
+            FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()""")
+        op.execute(f"UPDATE jobs SET search_vector = {SEARCH_VECTOR.format('')}")
+        op.execute("CREATE INDEX ix_jobs_search_vector ON jobs USING gin (search_vector)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS jobs_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS jobs_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS jobs_fts_ai")
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+        op.execute("DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs")
+        op.execute("DROP FUNCTION IF EXISTS jobs_search_vector_update()")
+        op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
@@ -6,13 +6,19 @@ from the Integrated Government Online Directory (IGOD) website.
 
 Output file: app/services/india_districts.py
 
+With --centroids it also geocodes every state and district (OpenStreetMap
+Nominatim, 1 request/second) into app/services/india_centroids.csv, the
+gazetteer bundled for offline lookups. Rows already in the CSV are kept, so
+an interrupted run resumes where it stopped.
+
 Run:
-  .\.venv\Scripts\python scripts\generate_india_districts.py
+  .\.venv\Scripts\python scripts\generate_india_districts.py [--centroids]
 
 This script uses only the standard library (requests is already in requirements).
 """
 import re
 import sys
+import csv
 import time
 import json
 from pathlib import Path
@@ -30,6 +36,8 @@ HEADERS = {
 
 ROOT = Path(__file__).resolve().parents[1]
 TARGET = ROOT / "app" / "services" / "india_districts.py"
+CENTROIDS_TARGET = ROOT / "app" / "services" / "india_centroids.csv"
+NOMINATIM_DELAY = 1.1  # seconds between requests (usage policy: max 1/s)
 
 STATE_LINK_RE = re.compile(r"href=\"/sg/([A-Z]{1,3})/E042/organizations\"[^>]*>([^<]+)</a>")
 ANCHOR_RE = re.compile(r"<a [^>]*href=\"([^\"]+)\"[^>]*>([^<]+)</a>", re.IGNORECASE)
@@ -96,6 +104,49 @@ def write_python(mapping: Dict[str, List[str]]) -> None:
     TARGET.write_text(body, encoding="utf-8")
 
 
+def write_centroids(mapping: Dict[str, List[str]]) -> None:
+    from geopy.geocoders import Nominatim
+
+    rows: Dict[Tuple[str, str], Tuple[float, float]] = {}
+    if CENTROIDS_TARGET.exists():
+        with open(CENTROIDS_TARGET, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                rows[(row["state"], row["district"])] = (float(row["latitude"]), float(row["longitude"]))
+
+    geolocator = Nominatim(user_agent=HEADERS["User-Agent"], timeout=20)
+    wanted = [(state, "") for state in mapping] + [
+        (state, district) for state, districts in mapping.items() for district in districts
+    ]
+    missing = [key for key in wanted if key not in rows]
+    print(f"Geocoding {len(missing)} of {len(wanted)} places ...")
+    for i, (state, district) in enumerate(missing, 1):
+        query = f"{district + ', ' if district else ''}{state}, India"
+        try:
+            location = geolocator.geocode(query)
+        except Exception as e:
+            print(f"    ERROR {query}: {e}", file=sys.stderr)
+            location = None
+        if location:
+            rows[(state, district)] = (round(location.latitude, 4), round(location.longitude, 4))
+        else:
+            print(f"    not found: {query}", file=sys.stderr)
+        # Checkpoint so an interrupted run keeps its progress
+        if i % 25 == 0 or i == len(missing):
+            _write_centroid_rows(rows)
+        time.sleep(NOMINATIM_DELAY)
+    _write_centroid_rows(rows)
+
+
+def _write_centroid_rows(rows: Dict[Tuple[str, str], Tuple[float, float]]) -> None:
+    tmp = CENTROIDS_TARGET.with_suffix(".csv.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["state", "district", "latitude", "longitude"])
+        for (state, district), (lat, lng) in sorted(rows.items()):
+            writer.writerow([state, district, f"{lat:.4f}", f"{lng:.4f}"])
+    tmp.replace(CENTROIDS_TARGET)
+
+
 def main() -> int:
     print(f"Fetching states from {STATES_INDEX} ...")
     html = fetch(STATES_INDEX)
@@ -120,6 +171,10 @@ def main() -> int:
 
     write_python(mapping)
     print(f"Wrote mapping to {TARGET}")
+
+    if "--centroids" in sys.argv[1:]:
+        write_centroids(mapping)
+        print(f"Wrote centroids to {CENTROIDS_TARGET}")
     return 0
 
 
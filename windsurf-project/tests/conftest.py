@@ -0,0 +1,66 @@
+import pytest
+
+from app import create_app, db
+from config import Config
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        JOB_INDEX_REFIT_INTERVAL = 0
+        PROFILE_VECTOR_PERSIST = False
+        TRANSLATION_CACHE_PERSIST = False
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        _reset_services()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _reset_services():
+    """The services are process-wide singletons; rebuild them per test database"""
+    from app.services.facet_index import facet_index
+    from app.services.job_index import job_index
+    from app.services.search_cache import search_cache
+    from app.services.tag_index import tag_index
+
+    job_index._built = False
+    tag_index._built = False
+    facet_index._built = False
+    search_cache.bump()
+
+
+@pytest.fixture
+def make_user(app):
+    from app.models import User
+
+    def make_user(username='worker', user_type='worker', **fields):
+        user = User(username=username, email=f'{username}@example.com', user_type=user_type, **fields)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def make_job(app, make_user):
+    from app.models import Job
+
+    clients = []
+
+    def make_job(title='Job', description='Work', tags=(), creator=None, **fields):
+        if creator is None:
+            if not clients:
+                clients.append(make_user('client', 'client'))
+            creator = clients[0]
+        job = Job(title=title, description=description, user_id=creator.id, **fields)
+        job.set_tags(list(tags))
+        db.session.add(job)
+        db.session.commit()
+        return job
+    return make_job
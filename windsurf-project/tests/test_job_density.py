@@ -0,0 +1,23 @@
+from app import db
+from app.models import JobDensityCell
+from app.services.geo import geohash_encode
+from app.services.job_density import job_density
+
+
+def _count(cell, status):
+    row = JobDensityCell.query.filter_by(cell=cell, status=status).first()
+    return row.job_count if row else 0
+
+
+def test_status_change_after_commit_moves_the_count(make_job):
+    geohash = geohash_encode(19.07, 72.87)
+    cell = geohash[:job_density.max_precision]
+    jobs = [make_job(title=f'Job {n}', geohash=geohash) for n in range(2)]
+    assert _count(cell, 'open') == 2
+
+    # Committing expires the job, so its old status is not loaded before the change
+    jobs[0].status = 'in_progress'
+    db.session.commit()
+
+    assert _count(cell, 'open') == 1
+    assert _count(cell, 'in_progress') == 1
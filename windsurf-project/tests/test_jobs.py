@@ -0,0 +1,17 @@
+from app.routes import jobs as jobs_routes
+from app.services.search_cache import search_cache
+
+
+def test_facet_match_bitmap_is_cached(make_job, monkeypatch):
+    make_job(title='Fix pipes', description='Leaking kitchen pipes')
+    make_job(title='Paint walls', description='Two bedroom flat')
+    computed = []
+    bitmap_from_ids = jobs_routes.bitmap_from_ids
+    monkeypatch.setattr(jobs_routes, 'bitmap_from_ids', lambda ids: computed.append(ids) or bitmap_from_ids(ids))
+    hits = search_cache.hits
+
+    bitmaps = [jobs_routes._match_bitmap('pipes', ranked=False) for _ in range(3)]
+
+    assert len(computed) == 1
+    assert search_cache.hits == hits + 2
+    assert all(bitmap is bitmaps[0] for bitmap in bitmaps)
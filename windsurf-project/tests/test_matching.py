@@ -0,0 +1,17 @@
+from app import db
+from app.models.user import UserSkill
+from app.services.matching import job_matching_service
+
+
+def test_recommendations_do_not_repeat_tag_matches(make_user, make_job):
+    worker = make_user()
+    db.session.add(UserSkill(user_id=worker.id, skill='plumbing'))
+    db.session.commit()
+    for n in range(3):
+        make_job(title=f'Fix pipes {n}', description='Leaking kitchen pipes', tags=['plumbing'])
+    make_job(title='Paint walls', description='Two bedroom flat', tags=['painting'])
+
+    recommended = [r['job'].id for r in job_matching_service.get_job_recommendations(worker, limit=10)]
+
+    assert len(recommended) == 4
+    assert len(set(recommended)) == len(recommended)
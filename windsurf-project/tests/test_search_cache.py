@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+from app.services.search_cache import SearchCache
+
+
+def test_concurrent_misses_compute_once():
+    cache = SearchCache()
+    key = (cache.version, 'plumber', '', '', 20)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [1, 2, 3]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [[1, 2, 3]] * 4
+    assert cache.get_or_compute(key, compute) == [1, 2, 3]
+    assert len(calls) == 1
+
+
+def test_errors_are_not_cached():
+    cache = SearchCache()
+    key = (cache.version, 'plumber', '', '', 20)
+
+    def fail():
+        raise ValueError('bad cursor')
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute(key, fail)
+    assert cache.get_or_compute(key, lambda: 'ok') == 'ok'
+
+
+def test_results_computed_across_a_bump_are_not_stored():
+    cache = SearchCache()
+    key = (cache.version, 'plumber', '', '', 20)
+
+    def compute():
+        cache.bump()
+        return 'stale'
+
+    assert cache.get_or_compute(key, compute) == 'stale'
+    assert cache.get_or_compute(key, lambda: 'fresh') == 'fresh'
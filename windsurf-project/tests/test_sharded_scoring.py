@@ -0,0 +1,36 @@
+import pytest
+
+from app import db
+from app.models import User
+from app.services.matching import job_matching_service
+from app.services.sharded_scoring import sharded_scorer
+from benchmarks import corpus
+
+
+@pytest.fixture
+def workers(app):
+    corpus.load(db, corpus.generate(2000, seed=42))
+    yield User.query.filter_by(user_type='worker').limit(5).all()
+    sharded_scorer.close()
+
+
+def _recommendations(user):
+    return [(r['job'].id, round(r['score'], 9)) for r in job_matching_service.get_job_recommendations(user)]
+
+
+def _first_page(user):
+    job_matching_service._page_cache.clear()
+    results, _ = job_matching_service.recommendation_page(user, limit=20)
+    return [(r['job'].id, round(r['score'], 9)) for r in results]
+
+
+def test_sharded_scores_match_in_process(workers, monkeypatch):
+    in_process = [(_recommendations(user), _first_page(user)) for user in workers]
+
+    monkeypatch.setattr(sharded_scorer, 'threshold', 1)
+    monkeypatch.setattr(sharded_scorer, 'workers', 2)
+    sharded = [(_recommendations(user), _first_page(user)) for user in workers]
+
+    assert sharded_scorer._published is not None
+    assert sharded == in_process
+    assert all(recommended and page for recommended, page in in_process)
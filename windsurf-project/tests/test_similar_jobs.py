@@ -0,0 +1,20 @@
+import random
+
+from app import db
+from app.models import Job
+from app.services.job_index import job_index
+from benchmarks import corpus
+from benchmarks.matching import _similar_recall
+
+
+def test_similar_jobs_recall_through_lsh(app, monkeypatch):
+    corpus.load(db, corpus.generate(3000, seed=42))
+    # Force the LSH path on a corpus small enough for a unit test
+    monkeypatch.setattr(job_index, 'exact_threshold', 0)
+    monkeypatch.setattr(job_index, 'ann_max_fraction', 1.0)
+    job_index.refit()
+
+    open_ids = [job_id for job_id, in db.session.query(Job.id).filter(Job.status == 'open')]
+    targets = random.Random(7).sample(open_ids, 50)
+
+    assert _similar_recall(targets, k=5) >= 0.9